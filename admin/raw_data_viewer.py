@@ -8,6 +8,7 @@ import pandas as pd
 import sqlite3
 import json
 import os
+import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import lancedb
@@ -16,12 +17,16 @@ from database.manual_knowledge_manager import ManualKnowledgeManager
 from cognee_integration.cognee_manager import CogneeManager
 from feedback.feedback_manager import FeedbackManager
 
+# Seconds a system overview is reused before the databases are queried again
+OVERVIEW_CACHE_TTL = 2.0
+
 class RawDataViewer:
     def __init__(self):
         self.lance_manager = LanceDBManager()
         self.manual_knowledge = ManualKnowledgeManager()
         self.cognee_manager = CogneeManager()
         self.feedback_manager = FeedbackManager()
+        self._overview_cache = None  # (overview, monotonic timestamp)
     
     def get_lancedb_raw_data(self, table_name: str = "knowledge_base", limit: int = 100) -> Dict[str, Any]:
         """Get raw data from LanceDB tables"""
@@ -224,8 +229,18 @@ class RawDataViewer:
         except Exception as e:
             return {"error": str(e)}
     
-    def get_system_overview(self) -> Dict[str, Any]:
-        """Get overview of all system databases"""
+    def get_system_overview(self, max_age: float = OVERVIEW_CACHE_TTL) -> Dict[str, Any]:
+        """Get overview of all system databases, reusing a result younger than max_age seconds"""
+        now = time.monotonic()
+        if self._overview_cache and now - self._overview_cache[1] < max_age:
+            return self._overview_cache[0]
+        
+        overview = self._build_system_overview()
+        self._overview_cache = (overview, now)
+        return overview
+    
+    def _build_system_overview(self) -> Dict[str, Any]:
+        """Query every database for the system overview"""
         overview = {
             "lancedb": {},
             "manual_knowledge": {},
@@ -297,42 +312,50 @@ class RawDataViewer:
     
     def search_across_databases(self, search_term: str, limit: int = 50) -> Dict[str, Any]:
         """Search for a term across all databases"""
-        results = {
-            "search_term": search_term,
-            "lancedb": [],
-            "manual_knowledge": [],
-            "cognee": [],
-            "feedback": []
-        }
+        return self.search_across_databases_batch([search_term], limit=limit)[0]
+    
+    def search_across_databases_batch(self, search_terms: List[str], limit: int = 50) -> List[Dict[str, Any]]:
+        """Search for several terms across all databases, loading each database only once"""
+        results = [
+            {
+                "search_term": search_term,
+                "lancedb": [],
+                "manual_knowledge": [],
+                "cognee": [],
+                "feedback": []
+            }
+            for search_term in search_terms
+        ]
         
         try:
-            # Search LanceDB
+            sources = []
+            
+            # LanceDB
             lancedb_data = self.get_lancedb_raw_data(limit=1000)
             if not lancedb_data.get("error") and lancedb_data.get("data"):
-                for row in lancedb_data["data"]["sample_data"]:
-                    if any(search_term.lower() in str(value).lower() for value in row.values()):
-                        results["lancedb"].append(row)
+                sources.append(("lancedb", lancedb_data["data"]["sample_data"]))
             
-            # Search Manual Knowledge
+            # Manual Knowledge
             manual_data = self.get_manual_knowledge_raw_data(limit=1000)
             if not manual_data.get("error"):
-                for row in manual_data["sample_data"]:
-                    if any(search_term.lower() in str(value).lower() for value in row.values()):
-                        results["manual_knowledge"].append(row)
+                sources.append(("manual_knowledge", manual_data["sample_data"]))
             
-            # Search Feedback
+            # Feedback
             feedback_data = self.get_feedback_raw_data(limit=1000)
             if not feedback_data.get("error"):
-                for row in feedback_data["sample_data"]:
-                    if any(search_term.lower() in str(value).lower() for value in row.values()):
-                        results["feedback"].append(row)
-            
-            # Limit results
-            for key in results:
-                if isinstance(results[key], list) and len(results[key]) > limit:
-                    results[key] = results[key][:limit]
+                sources.append(("feedback", feedback_data["sample_data"]))
+            
+            # Lowercase every value once and match all terms against it
+            terms_lower = [search_term.lower() for search_term in search_terms]
+            for db_name, rows in sources:
+                for row in rows:
+                    values_lower = [str(value).lower() for value in row.values()]
+                    for result, term in zip(results, terms_lower):
+                        if len(result[db_name]) < limit and any(term in value for value in values_lower):
+                            result[db_name].append(row)
                     
         except Exception as e:
-            results["error"] = str(e)
+            for result in results:
+                result["error"] = str(e)
         
-        return results 
\ No newline at end of file
+        return results
@@ -191,27 +191,27 @@ def display_enhanced_chat_history():
             result = chat['result']
             
             # Response with confidence indicators
-            confidence = result.get('confidence_indicators', {})
+            confidence = result.confidence_indicators
             
             col1, col2, col3 = st.columns([3, 1, 1])
             
             with col1:
                 st.markdown(f"**🤖 Answer:**")
-                st.markdown(result['response'])
+                st.markdown(result.response)
             
             with col2:
                 # Confidence indicators
                 st.markdown("**🎯 Confidence**")
-                overall_conf = confidence.get('overall_confidence', 0.5)
+                overall_conf = confidence.overall_confidence
                 st.progress(overall_conf)
                 st.caption(f"{overall_conf:.1%}")
                 
-                if confidence.get('has_manual_solutions'):
+                if confidence.has_manual_solutions:
                     st.success("✅ Manual solution")
                 
-                if result.get('validation') and result['validation'].get('is_valid'):
+                if result.validation and result.validation.get('is_valid'):
                     st.success("✅ Validated")
-                elif result.get('validation'):
+                elif result.validation:
                     st.warning("⚠️ Needs review")
             
             with col3:
@@ -227,8 +227,8 @@ def display_enhanced_chat_history():
                     show_feedback_form(chat, i)
             
             # Validation details
-            if result.get('validation') and st.checkbox(f"Show validation details", key=f"validation_{i}"):
-                validation = result['validation']
+            if result.validation and st.checkbox(f"Show validation details", key=f"validation_{i}"):
+                validation = result.validation
                 
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -242,23 +242,23 @@ def display_enhanced_chat_history():
                     st.warning("**Suggestions:** " + "; ".join(validation['suggestions']))
             
             # Sources with enhanced information
-            if result.get('original_sources') or result.get('manual_sources'):
-                with st.expander(f"📚 Sources ({result['total_sources']} total)"):
+            if result.original_sources or result.manual_sources:
+                with st.expander(f"📚 Sources ({result.total_sources} total)"):
                     
                     # Manual sources (higher priority)
-                    if result.get('manual_sources'):
+                    if result.manual_sources:
                         st.markdown("**🔧 Manual Solutions (from support agents):**")
-                        for j, source in enumerate(result['manual_sources'], 1):
-                            st.write(f"**{j}.** {source['brand']} {source['product_category']} - {source['issue_category']}")
-                            st.write(f"   📊 Confidence: {source['confidence_score']:.1%}")
-                            st.write(f"   🔧 Method: {source['resolution_method']}")
+                        for j, source in enumerate(result.manual_sources, 1):
+                            st.write(f"**{j}.** {source.brand} {source.product_category} - {source.issue_category}")
+                            st.write(f"   📊 Confidence: {source.confidence_score:.1%}")
+                            st.write(f"   🔧 Method: {source.resolution_method}")
                     
                     # Original documentation sources
-                    if result.get('original_sources'):
+                    if result.original_sources:
                         st.markdown("**📖 Original Documentation:**")
-                        for j, source in enumerate(result['original_sources'], 1):
-                            st.write(f"**{j}.** {source['brand']} {source['product_category']} - {source['document_type']}")
-                            st.write(f"   📄 File: {source['file_name']}")
+                        for j, source in enumerate(result.original_sources, 1):
+                            st.write(f"**{j}.** {source.brand} {source.product_category} - {source.document_type}")
+                            st.write(f"   📄 File: {source.file_name}")
             
             # Applied filters
             if chat['filters']:
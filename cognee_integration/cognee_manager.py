@@ -5,10 +5,23 @@ from config import COGNEE_API_KEY
 import os
 import sqlite3
 import pandas as pd
+import numpy as np
+import time
 from pathlib import Path
 
+# Seconds usage statistics are reused before the databases are queried again
+USAGE_STATS_CACHE_TTL = 2.0
+
+# Cognee keeps its system files inside the installed package
+COGNEE_SYSTEM_PATH = Path(cognee.__file__).parent / ".cognee_system"
+COGNEE_DATABASES_PATH = COGNEE_SYSTEM_PATH / "databases"
+COGNEE_SQLITE_DB = COGNEE_DATABASES_PATH / "cognee_db"
+
 class CogneeManager:
     def __init__(self):
+        self._usage_stats_cache = None  # (stats, monotonic timestamp)
+        self._db_info_cache = None  # (db_info, monotonic timestamp)
+        
         if COGNEE_API_KEY:
             os.environ["COGNEE_API_KEY"] = COGNEE_API_KEY
         
@@ -23,24 +36,50 @@ class CogneeManager:
         except Exception as e:
             print(f"Warning: Cognee configuration failed: {e}")
     
-    async def add_documents_async(self, file_paths: List[str]) -> bool:
-        """Add documents to Cognee knowledge graph"""
+    async def add_documents_async(self, file_paths: List[str], batch_size: int = 512) -> bool:
+        """Add documents to Cognee knowledge graph in batches, cognifying once at the end"""
         try:
-            await cognee.add(file_paths)
+            for start in range(0, len(file_paths), batch_size):
+                await cognee.add(file_paths[start:start + batch_size])
             await cognee.cognify()
             return True
         except Exception as e:
             print(f"Error adding documents to Cognee: {e}")
             return False
+        finally:
+            self._usage_stats_cache = None
+            self._db_info_cache = None
     
-    def add_documents(self, file_paths: List[str]) -> bool:
+    def add_documents(self, file_paths: List[str], batch_size: int = 512) -> bool:
         """Synchronous wrapper for adding documents"""
         try:
-            return asyncio.run(self.add_documents_async(file_paths))
+            return asyncio.run(self.add_documents_async(file_paths, batch_size))
         except Exception as e:
             print(f"Error in Cognee add_documents: {e}")
             return False
     
+    async def add_parquet_async(self, parquet_path: str, content_column: str = "content") -> bool:
+        """Add every row of a Parquet document bundle to Cognee in one add call, then cognify"""
+        try:
+            contents = pd.read_parquet(parquet_path, columns=[content_column])[content_column].tolist()
+            await cognee.add(contents)
+            await cognee.cognify()
+            return True
+        except Exception as e:
+            print(f"Error adding Parquet bundle to Cognee: {e}")
+            return False
+        finally:
+            self._usage_stats_cache = None
+            self._db_info_cache = None
+    
+    def add_parquet(self, parquet_path: str, content_column: str = "content") -> bool:
+        """Synchronous wrapper for adding a Parquet document bundle"""
+        try:
+            return asyncio.run(self.add_parquet_async(parquet_path, content_column))
+        except Exception as e:
+            print(f"Error in Cognee add_parquet: {e}")
+            return False
+    
     async def query_async(self, query: str, user_id: str = "default_user") -> str:
         """Query the Cognee knowledge base"""
         try:
@@ -71,6 +110,18 @@ class CogneeManager:
             print(f"Error in Cognee query: {e}")
             return f"Cognee query failed: {e}"
     
+    async def query_batch_async(self, queries: List[str], user_id: str = "default_user") -> List[str]:
+        """Run several Cognee queries concurrently, preserving input order"""
+        return await asyncio.gather(*(self.query_async(query, user_id) for query in queries))
+    
+    def query_batch(self, queries: List[str], user_id: str = "default_user") -> List[str]:
+        """Synchronous wrapper for batch querying"""
+        try:
+            return asyncio.run(self.query_batch_async(queries, user_id))
+        except Exception as e:
+            print(f"Error in Cognee batch query: {e}")
+            return [f"Cognee query failed: {e}"] * len(queries)
+    
     async def reset_async(self) -> bool:
         """Reset the Cognee knowledge base"""
         try:
@@ -80,6 +131,9 @@ class CogneeManager:
         except Exception as e:
             print(f"Error resetting Cognee: {e}")
             return False
+        finally:
+            self._usage_stats_cache = None
+            self._db_info_cache = None
     
     def reset(self) -> bool:
         """Synchronous wrapper for resetting"""
@@ -110,15 +164,25 @@ class CogneeManager:
             status["configuration"]["error"] = str(e)
         
         # Get database information
-        status["databases"] = self._get_database_info()
+        status["databases"] = self.get_database_info()
         
         # Get system directories
         status["system_info"] = self._get_system_info()
         
         return status
     
-    def _get_database_info(self) -> Dict[str, Any]:
-        """Get information about Cognee databases"""
+    def get_database_info(self, max_age: float = USAGE_STATS_CACHE_TTL) -> Dict[str, Any]:
+        """Get Cognee database information, reusing a result younger than max_age seconds"""
+        now = time.monotonic()
+        if self._db_info_cache and now - self._db_info_cache[1] < max_age:
+            return self._db_info_cache[0]
+        
+        db_info = self._get_database_info()
+        self._db_info_cache = (db_info, now)
+        return db_info
+    
+    def _get_database_info(self, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
+        """Get information about Cognee databases, reusing conn for the SQLite metadata if given"""
         db_info = {
             "sqlite": {},
             "vector": {},
@@ -127,15 +191,15 @@ class CogneeManager:
         
         try:
             # SQLite database information
-            sqlite_path = Path.home() / ".pyenv/versions/3.12.2/lib/python3.12/site-packages/cognee/.cognee_system/databases"
+            sqlite_path = COGNEE_DATABASES_PATH
             if sqlite_path.exists():
                 db_info["sqlite"]["path"] = str(sqlite_path)
                 
                 # Try to connect and get table information
-                cognee_db_path = sqlite_path / "cognee_db"
+                cognee_db_path = COGNEE_SQLITE_DB
                 if cognee_db_path.exists():
                     db_info["sqlite"]["database_file"] = str(cognee_db_path)
-                    db_info["sqlite"]["tables"] = self._get_sqlite_tables(cognee_db_path)
+                    db_info["sqlite"]["tables"] = self._get_sqlite_tables(cognee_db_path, conn)
             
             # Vector database information
             vector_db_path = sqlite_path / "cognee.lancedb"
@@ -154,11 +218,23 @@ class CogneeManager:
         
         return db_info
     
-    def _get_sqlite_tables(self, db_path: Path) -> Dict[str, Any]:
+    def get_database_sizes(self, db_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get database sizes as parallel columns: {"names": [...], "sizes_mb": ndarray}"""
+        if db_info is None:
+            db_info = self.get_database_info()
+        names = [db_type for db_type, info in db_info.items() if isinstance(info, dict) and 'size_mb' in info]
+        return {
+            "names": names,
+            "sizes_mb": np.array([db_info[name]["size_mb"] for name in names], dtype=np.float64)
+        }
+    
+    def _get_sqlite_tables(self, db_path: Path, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
         """Get SQLite table information"""
         tables = {}
+        owns_conn = conn is None
         try:
-            conn = sqlite3.connect(str(db_path))
+            if owns_conn:
+                conn = sqlite3.connect(str(db_path))
             cursor = conn.cursor()
             
             # Get table names
@@ -177,17 +253,27 @@ class CogneeManager:
                     "row_count": count,
                     "columns": [{"name": col[1], "type": col[2]} for col in columns]
                 }
-            
-            conn.close()
         except Exception as e:
             tables["error"] = str(e)
+        finally:
+            if owns_conn and conn is not None:
+                conn.close()
         
         return tables
     
     def _get_directory_size(self, path: Path) -> float:
         """Get directory size in MB"""
         try:
-            total_size = sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+            # Single scandir pass per directory; DirEntry caches file type and stat results
+            total_size = 0
+            pending = [str(path)]
+            while pending:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file():
+                            total_size += entry.stat().st_size
             return round(total_size / (1024 * 1024), 2)
         except:
             return 0.0
@@ -201,7 +287,7 @@ class CogneeManager:
             
             # Look for common Cognee system directories
             possible_paths = [
-                Path.home() / ".pyenv/versions/3.12.2/lib/python3.12/site-packages/cognee/.cognee_system",
+                COGNEE_SYSTEM_PATH,
                 Path.home() / ".cognee_system",
                 Path.cwd() / ".cognee_system"
             ]
@@ -217,8 +303,19 @@ class CogneeManager:
         
         return info
     
-    def get_usage_statistics(self) -> Dict[str, Any]:
-        """Get Cognee usage statistics"""
+    def get_usage_statistics(self, max_age: float = USAGE_STATS_CACHE_TTL) -> Dict[str, Any]:
+        """Get Cognee usage statistics, reusing a result younger than max_age seconds"""
+        now = time.monotonic()
+        if self._usage_stats_cache and now - self._usage_stats_cache[1] < max_age:
+            return self._usage_stats_cache[0]
+        
+        stats = self._build_usage_statistics(max_age=max_age)
+        self._usage_stats_cache = (stats, now)
+        return stats
+    
+    def _build_usage_statistics(self, db_info: Optional[Dict[str, Any]] = None,
+                                max_age: float = USAGE_STATS_CACHE_TTL) -> Dict[str, Any]:
+        """Query the Cognee databases for usage statistics, reusing database info younger than max_age seconds"""
         stats = {
             "documents": {},
             "queries": {},
@@ -226,7 +323,8 @@ class CogneeManager:
         }
         
         try:
-            db_info = self._get_database_info()
+            if db_info is None:
+                db_info = self.get_database_info(max_age)
             
             # Document statistics from SQLite
             if "sqlite" in db_info and "tables" in db_info["sqlite"]:
@@ -259,17 +357,27 @@ class CogneeManager:
     
     def explore_data(self, table_name: str = None, limit: int = 10) -> Dict[str, Any]:
         """Explore Cognee data in SQLite database"""
-        result = {"tables": [], "data": {}}
-        
         try:
-            db_info = self._get_database_info()
+            db_info = self.get_database_info()
             sqlite_db = db_info.get("sqlite", {}).get("database_file")
             
             if not sqlite_db or not Path(sqlite_db).exists():
                 return {"error": "Cognee SQLite database not found"}
             
             conn = sqlite3.connect(sqlite_db)
+            try:
+                return self._explore_connection(conn, table_name, limit)
+            finally:
+                conn.close()
             
+        except Exception as e:
+            return {"tables": [], "data": {}, "error": str(e)}
+    
+    def _explore_connection(self, conn: sqlite3.Connection, table_name: str = None, limit: int = 10) -> Dict[str, Any]:
+        """Collect table names and sample rows over an open SQLite connection"""
+        result = {"tables": [], "data": {}}
+        
+        try:
             # Get all table names
             cursor = conn.cursor()
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
@@ -299,9 +407,27 @@ class CogneeManager:
                     except Exception as e:
                         result["data"][table] = {"error": str(e)}
             
-            conn.close()
-            
         except Exception as e:
             result["error"] = str(e)
         
-        return result 
\ No newline at end of file
+        return result
+    
+    def get_full_diagnostic(self) -> Dict[str, Any]:
+        """Database info, usage statistics and data exploration over a single SQLite connection"""
+        sqlite_db = COGNEE_SQLITE_DB
+        conn = sqlite3.connect(str(sqlite_db)) if sqlite_db.exists() else None
+        try:
+            db_info = self._get_database_info(conn)
+            stats = self._build_usage_statistics(db_info)
+            if conn is not None:
+                explore = self._explore_connection(conn)
+            else:
+                explore = {"error": "Cognee SQLite database not found"}
+        finally:
+            if conn is not None:
+                conn.close()
+        
+        now = time.monotonic()
+        self._db_info_cache = (db_info, now)
+        self._usage_stats_cache = (stats, now)
+        return {"db_info": db_info, "stats": stats, "explore": explore}
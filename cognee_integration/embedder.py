@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Shared Embedding Model
+One SentenceTransformer instance per model name for the whole process, so
+managers constructed side by side do not each load their own weights
+"""
+
+import functools
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # 384 dimensions, matches VECTOR_DIMENSION
+
+@functools.lru_cache(maxsize=None)
+def get_embedder(name: str = DEFAULT_EMBEDDING_MODEL):
+    """Load the sentence-transformer model once and return the shared instance"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(f"sentence-transformers/{name}")
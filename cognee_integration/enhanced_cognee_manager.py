@@ -7,13 +7,22 @@ Leverages knowledge graphs and DataPoint model for intelligent understanding
 
 import asyncio
 import cognee
+import copy
 import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import pandas as pd
 import sqlite3
 import json
+import time
 from datetime import datetime
+from cognee_integration.semantic_cache import SemanticCache
+from cognee_integration.embedder import get_embedder
+from config import VECTOR_DIMENSION
+
+# Seconds DataPoint information is reused before Cognee's SQLite database is read again,
+# so writes from other managers or processes show up shortly after they land
+DATAPOINT_INFO_CACHE_TTL = 2.0
 
 class EnhancedCogneeManager:
     def __init__(self):
@@ -24,6 +33,9 @@ class EnhancedCogneeManager:
             "llm_provider": "openai",
             "embedding_model": "all-MiniLM-L6-v2"
         }
+        self._encoder = None  # Loaded on first query
+        self.query_cache = SemanticCache(VECTOR_DIMENSION, threshold=0.9, max_size=1024)
+        self._datapoint_info = None  # (get_datapoints_info result, monotonic timestamp)
         self._initialize_cognee()
         
     def _initialize_cognee(self):
@@ -66,6 +78,8 @@ class EnhancedCogneeManager:
             print("🕸️ Building knowledge graph and finding connections...")
             await cognee.cognify()
             print("✅ Knowledge graph built successfully")
+            self._invalidate_datapoints()
+            self.query_cache.clear()  # Cached answers predate the new knowledge
             
             return {
                 "status": "success",
@@ -99,6 +113,14 @@ class EnhancedCogneeManager:
                 if brand or product:
                     enhanced_query = f"{query} (Context: {brand} {product})"
             
+            # Serve semantic repeats from the cache before touching the Cognee backend
+            query_embedding = self._embed_query(enhanced_query)
+            cached = self.query_cache.get(query_embedding)
+            if cached is not None:
+                print("⚡ Served from semantic cache")
+                # Deep copy so callers cannot mutate the nested dicts held by the cache
+                return {**copy.deepcopy(cached), "query": query, "enhanced_query": enhanced_query}
+            
             # Try different Cognee search API patterns
             try:
                 search_results = await cognee.search("SIMILARITY", query_text=enhanced_query)
@@ -126,7 +148,7 @@ class EnhancedCogneeManager:
                     }
                     processed_results.append(processed_result)
             
-            return {
+            result = {
                 "status": "success",
                 "query": query,
                 "enhanced_query": enhanced_query,
@@ -134,11 +156,19 @@ class EnhancedCogneeManager:
                 "memory_insights": await self._get_memory_insights(query),
                 "graph_connections": await self._get_related_concepts(query)
             }
+            self.query_cache.put(query_embedding, copy.deepcopy(result))
+            return result
             
         except Exception as e:
             print(f"❌ Error in intelligent query: {e}")
             return {"status": "error", "error": str(e), "results": []}
     
+    def _embed_query(self, text: str):
+        """Embed a query for the semantic cache"""
+        if self._encoder is None:
+            self._encoder = get_embedder(self.config['embedding_model'])
+        return self._encoder.encode(text)
+    
     async def _get_memory_insights(self, query: str) -> Dict[str, Any]:
         """Get insights from Cognee's memory system"""
         try:
@@ -187,21 +217,32 @@ class EnhancedCogneeManager:
         except Exception as e:
             return {"error": str(e)}
     
-    def get_datapoints_info(self) -> Dict[str, Any]:
-        """Get information about Cognee's DataPoints (graph nodes)"""
+    def get_datapoints_info(self, max_age: float = DATAPOINT_INFO_CACHE_TTL) -> Dict[str, Any]:
+        """Get information about Cognee's DataPoints (graph nodes), reusing a result younger than max_age seconds"""
+        now = time.monotonic()
+        if self._datapoint_info and now - self._datapoint_info[1] < max_age:
+            return self._datapoint_info[0]
+        
         try:
             db_info = self._get_database_info()
             sqlite_info = db_info.get("sqlite", {})
             
             # DataPoints are stored in Cognee's SQLite database
             if sqlite_info and sqlite_info.get("database_file"):
-                return self._analyze_datapoints(sqlite_info["database_file"])
+                datapoint_info = self._analyze_datapoints(sqlite_info["database_file"])
+                if "error" not in datapoint_info:
+                    self._datapoint_info = (datapoint_info, now)
+                return datapoint_info
             else:
                 return {"error": "DataPoints database not found"}
                 
         except Exception as e:
             return {"error": str(e)}
     
+    def _invalidate_datapoints(self):
+        """Forget cached DataPoint counts after Cognee ingests new content"""
+        self._datapoint_info = None
+    
     def _analyze_datapoints(self, db_path: str) -> Dict[str, Any]:
         """Analyze Cognee's DataPoints in SQLite database"""
         try:
@@ -218,21 +259,27 @@ class EnhancedCogneeManager:
                 "datapoint_types": []
             }
             
-            # Analyze each potential DataPoint table
+            # Count every DataPoint table in a single UNION ALL query
+            counts = {}
+            if datapoint_tables:
+                count_query = " UNION ALL ".join(
+                    f"SELECT ?, COUNT(*) FROM `{table}`" for table in datapoint_tables
+                )
+                try:
+                    counts = dict(cursor.execute(count_query, datapoint_tables).fetchall())
+                except sqlite3.Error:
+                    counts = {}
+            
             for table in datapoint_tables:
+                if table not in counts:
+                    continue
                 try:
-                    count_query = f"SELECT COUNT(*) FROM `{table}`"
-                    cursor.execute(count_query)
-                    count = cursor.fetchone()[0]
-                    datapoint_info["total_datapoints"] += count
-                    
-                    # Get sample data to understand structure
-                    sample_query = f"SELECT * FROM `{table}` LIMIT 1"
-                    cursor.execute(sample_query)
-                    columns = [description[0] for description in cursor.description]
+                    # Column names come from the schema, no rows are read
+                    columns = [col[1] for col in cursor.execute(f"PRAGMA table_info(`{table}`)").fetchall()]
+                    datapoint_info["total_datapoints"] += counts[table]
                     datapoint_info["datapoint_types"].append({
                         "table": table,
-                        "count": count,
+                        "count": counts[table],
                         "columns": columns
                     })
                 except:
@@ -290,6 +337,8 @@ Confidence: {metadata.get('confidence_score', 0.8)}
             # Add to Cognee's memory system
             await cognee.add([memory_content])
             await cognee.cognify()  # Rebuild knowledge graph with new memory
+            self._invalidate_datapoints()
+            self.query_cache.clear()  # Cached answers predate the new knowledge
             
             print(f"✅ Added manual memory to AI memory engine")
             return True
@@ -358,7 +407,16 @@ Confidence: {metadata.get('confidence_score', 0.8)}
     def _get_directory_size(self, path: Path) -> float:
         """Get directory size in MB"""
         try:
-            total_size = sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
-            return round(total_size / (1024*1024), 2)
+            # Single scandir pass per directory; DirEntry caches file type and stat results
+            total_size = 0
+            pending = [str(path)]
+            while pending:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file():
+                            total_size += entry.stat().st_size
+            return round(total_size / (1024 * 1024), 2)
         except:
             return 0.0 
\ No newline at end of file
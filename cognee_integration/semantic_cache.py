@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Semantic Query Cache
+Caches answers keyed by query embedding and serves repeats of semantically
+similar queries (cosine similarity above a threshold) without hitting Cognee.
+Embeddings are stored SQ8-quantized: int8 components plus a per-row scale
+"""
+
+from typing import Any, List, Optional
+import numpy as np
+
+class SemanticCache:
+    def __init__(self, dimension: int, threshold: float = 0.9, max_size: int = 1024):
+        """Preallocate the embedding matrix; least recently used entries are evicted when full"""
+        self.threshold = threshold
+        self.max_size = max_size
+        self._matrix = np.zeros((max_size, dimension), dtype=np.int8)
+        self._scales = np.zeros(max_size, dtype=np.float32)
+        self._answers: List[Any] = []
+        self._last_used = np.zeros(max_size, dtype=np.int64)
+        self._clock = 0
+    
+    def get(self, embedding: np.ndarray) -> Optional[Any]:
+        """Return the cached answer for the most similar query, if similar enough"""
+        if not self._answers:
+            return None
+        
+        # Integer dot products (int32 accumulate, int16 would overflow at 127*127*d), rescaled per row
+        query, query_scale = self._quantize(self._normalize(embedding))
+        count = len(self._answers)
+        dots = self._matrix[:count].astype(np.int32) @ query.astype(np.int32)
+        scores = dots * (self._scales[:count] * query_scale)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        
+        self._touch(best)
+        return self._answers[best]
+    
+    def put(self, embedding: np.ndarray, answer: Any):
+        """Cache an answer for a query embedding"""
+        if len(self._answers) < self.max_size:
+            slot = len(self._answers)
+            self._answers.append(answer)
+        else:
+            slot = int(np.argmin(self._last_used))
+            self._answers[slot] = answer
+        
+        self._matrix[slot], self._scales[slot] = self._quantize(self._normalize(embedding))
+        self._touch(slot)
+    
+    def clear(self):
+        """Drop all cached entries"""
+        self._answers = []
+        self._last_used[:] = 0
+        self._clock = 0
+    
+    def __len__(self) -> int:
+        return len(self._answers)
+    
+    def _touch(self, slot: int):
+        self._clock += 1
+        self._last_used[slot] = self._clock
+    
+    @staticmethod
+    def _quantize(vector: np.ndarray):
+        """SQ8: map the largest component to +-127 and keep the scale to undo it"""
+        peak = float(np.max(np.abs(vector)))
+        if peak == 0:
+            return np.zeros(vector.shape, dtype=np.int8), np.float32(0)
+        scale = np.float32(peak / 127)
+        return np.round(vector / scale).astype(np.int8), scale
+    
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
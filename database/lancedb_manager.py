@@ -2,7 +2,7 @@ import lancedb
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
+from cognee_integration.embedder import get_embedder
 import os
 from config import LANCEDB_PATH, VECTOR_DIMENSION
 
@@ -10,7 +10,7 @@ class LanceDBManager:
     def __init__(self, db_path: str = LANCEDB_PATH):
         self.db_path = db_path
         self.db = lancedb.connect(db_path)
-        self.encoder = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        self.encoder = get_embedder()
         self.table_name = "knowledge_base"
         self._initialize_table()
     
@@ -1,22 +1,138 @@
+import os
+import time
 import uuid
+import atexit
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
+from cognee_integration.embedder import get_embedder
 from database.lancedb_manager import LanceDBManager
 from feedback.feedback_manager import FeedbackManager
 from config import VECTOR_DIMENSION
 
+# Query embeddings persisted across runs, keyed by a digest of the normalized query text
+EMBEDDING_CACHE_PATH = Path.home() / ".cache" / "electronics_agent" / "query_embeddings.npz"
+EMBEDDING_CACHE_MAX_ENTRIES = 10000
+
+# Seconds between checks for table writes made by other connections; this instance's own writes apply at once
+TABLE_VERSION_CHECK_INTERVAL = 1.0
+
+class _QueryEmbeddingCache:
+    """Process-wide LRU of query embeddings, saved at exit as an .npz (no pickle, no raw query text) if any were added"""
+    
+    def __init__(self, path: Path, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._loaded = False
+        self._dirty = False
+        self._save_registered = False
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            self._load()
+            digest = self._digest(key)
+            vector = self._entries.get(digest)
+            if vector is not None:
+                self._entries.move_to_end(digest)
+            return vector
+    
+    def put_many(self, keys: List[str], vectors):
+        with self._lock:
+            self._load()
+            for key, vector in zip(keys, vectors):
+                digest = self._digest(key)
+                self._entries[digest] = np.asarray(vector, dtype=np.float32)
+                self._entries.move_to_end(digest)
+            self._evict()
+            self._dirty = True
+            # Registered on the first insert, so importers that never embed a query leave the file alone
+            if not self._save_registered:
+                atexit.register(self.save)
+                self._save_registered = True
+    
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._load()
+            return self._digest(key) in self._entries
+    
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def _read_file(self) -> "OrderedDict[str, np.ndarray]":
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                return OrderedDict(zip(data['keys'].tolist(), data['vectors']))
+        except Exception:
+            return OrderedDict()
+    
+    def _load(self):
+        if not self._loaded:
+            self._entries = self._read_file()
+            self._evict()
+            self._loaded = True
+    
+    def save(self):
+        """Merge this run's embeddings into the file on disk, newest last, capped at max_entries"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                merged = self._read_file()
+                for digest, vector in self._entries.items():
+                    merged.pop(digest, None)
+                    merged[digest] = vector
+                while len(merged) > self.max_entries:
+                    merged.popitem(last=False)
+                
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.npz')
+                with os.fdopen(fd, 'wb') as f:
+                    np.savez(f, keys=np.array(list(merged.keys()), dtype=str),
+                             vectors=np.array(list(merged.values()), dtype=np.float32).reshape(len(merged), -1))
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except Exception as e:
+                print(f"⚠️ Could not save embedding cache: {e}")
+
+_query_embeddings = _QueryEmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES)
+
+def format_timestamp(value: Any) -> str:
+    """ISO string for a stored timestamp; callers may pass time.time_ns() integers instead of strings"""
+    if isinstance(value, int):
+        return datetime.fromtimestamp(value / 1e9).isoformat()
+    return value
+
 class ManualKnowledgeManager:
-    def __init__(self, db_path: str = "./manual_knowledge_db"):
+    def __init__(self, db_path: str = "./manual_knowledge_db", use_lsh: bool = False,
+                 lsh_bits: int = 16, lsh_max_distance: int = 4):
         self.db_path = db_path
-        self.encoder = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        self.encoder = get_embedder()
         self.table_name = "manual_knowledge"
         
+        # Optional random-projection LSH prefilter in front of the exact cosine scan
+        self.use_lsh = use_lsh
+        self.lsh_max_distance = lsh_max_distance
+        self._lsh_planes = np.random.default_rng(0).standard_normal((lsh_bits, VECTOR_DIMENSION)).astype(np.float32)
+        self._lsh_weights = np.left_shift(np.uint64(1), np.arange(lsh_bits, dtype=np.uint64))
+        
         # Initialize LanceDB for manual knowledge
         import lancedb
         self.db = lancedb.connect(db_path)
         self._initialize_table()
+        self._load_search_matrix()
         
         # Initialize feedback manager
         self.feedback_manager = FeedbackManager()
@@ -63,6 +179,85 @@ class ManualKnowledgeManager:
             self.table = self.db.create_table(self.table_name, dummy_data, schema=schema)
             self.table.delete("id = 'dummy'")
     
+    def _load_search_matrix(self):
+        """Load entries into an L2-normalized in-memory matrix so search is a single matmul"""
+        # Version first: a write landing before to_pandas only causes one extra reload later
+        self._matrix_version = self._table_version()
+        self._version_checked_at = time.monotonic()
+        self._rows = []
+        self._matrix = np.empty((0, VECTOR_DIMENSION), dtype=np.float32)
+        self._lsh_codes = np.empty(0, dtype=np.uint64)
+        self._append_to_search_matrix(self.table.to_pandas())
+    
+    def _table_version(self) -> int:
+        """Latest version of the LanceDB table, including writes by other connections"""
+        if hasattr(self.table, 'checkout_latest'):
+            self.table.checkout_latest()
+        return self.table.version
+    
+    def _sync_search_matrix(self, force: bool = False):
+        """Reload the search matrix if the table changed since it was built, e.g. by another instance"""
+        # Checking reads the LanceDB manifest, so searches do it at most once per interval
+        now = time.monotonic()
+        if not force and now - self._version_checked_at < TABLE_VERSION_CHECK_INTERVAL:
+            return
+        self._version_checked_at = now
+        if self._table_version() != self._matrix_version:
+            self._load_search_matrix()
+    
+    def _apply_own_write(self, data: pd.DataFrame, version_before: int):
+        """Append rows this instance just wrote, or reload if anyone else wrote in between"""
+        version = self._table_version()
+        if version_before == self._matrix_version and version == version_before + 1:
+            self._append_to_search_matrix(data)
+            self._matrix_version = version
+        else:
+            self._load_search_matrix()
+    
+    def _append_to_search_matrix(self, data: pd.DataFrame):
+        """Append newly stored entries to the in-memory search matrix"""
+        if len(data) == 0:
+            return
+        
+        vectors = self._normalize_rows(np.vstack(data['embedding'].to_numpy()).astype(np.float32))
+        self._matrix = np.vstack([self._matrix, vectors])
+        self._lsh_codes = np.concatenate([self._lsh_codes, self._lsh_hash(vectors)])
+        self._rows.extend(data.drop(columns=['embedding']).to_dict('records'))
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """Return the unit-norm embedding of a query, cached by normalized text"""
+        # The model is uncased, so lowercasing does not change the embedding
+        return self._encode_query(query.strip().lower())
+    
+    def _encode_query(self, key: str) -> np.ndarray:
+        vector = _query_embeddings.get(key)
+        if vector is None:
+            vector = self._normalize_rows(self.encoder.encode(key).astype(np.float32).reshape(1, -1))[0]
+            _query_embeddings.put_many([key], [vector])
+        return vector
+    
+    def save_embedding_cache(self):
+        """Persist query embeddings computed in this run"""
+        _query_embeddings.save()
+    
+    def _lsh_hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Pack the signs of the random projections of each row into a uint64 code"""
+        bits = (vectors @ self._lsh_planes.T) > 0
+        return (bits.astype(np.uint64) * self._lsh_weights).sum(axis=1, dtype=np.uint64)
+    
+    @staticmethod
+    def _hamming_distance(codes: np.ndarray, code: np.uint64) -> np.ndarray:
+        """Popcount of codes XOR code, one byte-unpack for the whole array"""
+        xor = np.bitwise_xor(codes, code)
+        return np.unpackbits(xor.view(np.uint8)).reshape(len(codes), 64).sum(axis=1)
+    
+    @staticmethod
+    def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize each row of a matrix"""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+    
     def sync_from_feedback(self) -> int:
         """Sync manual learning data from feedback manager"""
         learning_data = self.feedback_manager.get_manual_learning_data()
@@ -121,7 +316,9 @@ class ManualKnowledgeManager:
                 "confidence_score": [confidence_score]
             })
             
+            version_before = self._table_version()
             self.table.add(data)
+            self._apply_own_write(data, version_before)
             print(f"✅ Successfully added manual knowledge entry: {entry['id']}")
             return True
             
@@ -131,11 +328,57 @@ class ManualKnowledgeManager:
             traceback.print_exc()
             return False
     
+    def _add_manual_entries(self, entries: List[Dict[str, Any]]) -> int:
+        """Add several manual learning entries with one embedding call and one table write"""
+        try:
+            # Writes are rare; deduplicate against the current table
+            self._sync_search_matrix(force=True)
+            existing_ids = {row.get('id') for row in self._rows}
+            new_entries = []
+            for entry in entries:
+                if entry['id'] in existing_ids:
+                    print(f"Manual entry with ID {entry['id']} already exists")
+                else:
+                    existing_ids.add(entry['id'])
+                    new_entries.append(entry)
+            if not new_entries:
+                return 0
+            
+            combined_texts = [f"Question: {entry['question']} Solution: {entry['solution']}" for entry in new_entries]
+            embeddings = np.asarray(self.encoder.encode(combined_texts, batch_size=32), dtype=np.float32)
+            
+            data = pd.DataFrame({
+                "id": [entry['id'] for entry in new_entries],
+                "question": [entry['question'] for entry in new_entries],
+                "solution": [entry['solution'] for entry in new_entries],
+                "embedding": [embedding.tolist() for embedding in embeddings],
+                "brand": [entry.get('brand', '') for entry in new_entries],
+                "product_category": [entry.get('product_category', '') for entry in new_entries],
+                "issue_category": [entry.get('issue_category', '') for entry in new_entries],
+                "resolution_method": [entry.get('resolution_method', '') for entry in new_entries],
+                "timestamp": [entry.get('timestamp', '') for entry in new_entries],
+                "source_type": [entry.get('source_type', 'manual') for entry in new_entries],
+                "tags": [str(entry.get('tags', [])) for entry in new_entries],
+                "confidence_score": [self._calculate_confidence_score(entry) for entry in new_entries]
+            })
+            
+            version_before = self._table_version()
+            self.table.add(data)
+            self._apply_own_write(data, version_before)
+            print(f"✅ Successfully added {len(new_entries)} manual knowledge entries")
+            return len(new_entries)
+            
+        except Exception as e:
+            print(f"❌ Error adding manual entries: {e}")
+            import traceback
+            traceback.print_exc()
+            return 0
+    
     def search_manual_knowledge(self, query: str, limit: int = 5, filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
         """Search manual knowledge base"""
         try:
             # Generate query embedding
-            query_embedding = self.encoder.encode(query).astype(np.float32)
+            query_embedding = self.embed_query(query)
             
             # Build search
             search = self.table.search(query_embedding, vector_column_name="embedding").limit(limit * 2)  # Get more for filtering
@@ -211,7 +454,7 @@ class ManualKnowledgeManager:
                 'product_category': metadata.get('product_category', ''),
                 'issue_category': metadata.get('issue_category', ''),
                 'resolution_method': metadata.get('resolution_method', ''),
-                'timestamp': metadata.get('timestamp', ''),
+                'timestamp': format_timestamp(metadata.get('timestamp', '')),
                 'source_type': 'real_time_manual',
                 'tags': metadata.get('tags', [])
             }
@@ -226,50 +469,136 @@ class ManualKnowledgeManager:
         
         return feedback_id
     
+    def add_real_time_feedback_batch(self, items: List[Dict[str, Any]]) -> List[str]:
+        """Add several real-time feedback items (add_real_time_feedback's arguments) in one feedback append and one table write"""
+        feedback_ids = self.feedback_manager.log_unsatisfactory_answers([
+            {
+                'user_question': item['user_question'],
+                'original_answer': item['original_answer'],
+                'original_sources': item['metadata'].get('original_sources', []),
+                'manual_solution': item['manual_solution'],
+                'support_agent': item['support_agent'],
+                'feedback_details': item['metadata']
+            }
+            for item in items
+        ])
+        
+        # Only satisfied customers' solutions become manual knowledge
+        manual_entries = []
+        for feedback_id, item in zip(feedback_ids, items):
+            metadata = item['metadata']
+            customer_satisfaction = metadata.get('customer_satisfaction')
+            if customer_satisfaction in ['satisfied', 'very_satisfied', '4', '5']:
+                manual_entries.append({
+                    'id': feedback_id,
+                    'question': item['user_question'],
+                    'solution': item['manual_solution'],
+                    'brand': metadata.get('brand', ''),
+                    'product_category': metadata.get('product_category', ''),
+                    'issue_category': metadata.get('issue_category', ''),
+                    'resolution_method': metadata.get('resolution_method', ''),
+                    'timestamp': format_timestamp(metadata.get('timestamp', '')),
+                    'source_type': 'real_time_manual',
+                    'tags': metadata.get('tags', [])
+                })
+            else:
+                print(f"⚠️ Customer satisfaction '{customer_satisfaction}' does not meet criteria for manual knowledge creation ({feedback_id})")
+        
+        if manual_entries:
+            self._add_manual_entries(manual_entries)
+        
+        return feedback_ids
+    
     def search(self, query: str, limit: int = 5, brand_filter: str = None, product_filter: str = None) -> List[Dict[str, Any]]:
         """Search manual knowledge database"""
         try:
-            # Generate query embedding
-            query_embedding = self.encoder.encode(query).astype(np.float32)
-            
-            # Search the table
-            search_result = self.table.search(query_embedding, vector_column_name="embedding").limit(limit * 2)
-            df = search_result.to_pandas()
-            
-            # Apply filters if provided
-            if brand_filter and 'brand' in df.columns:
-                df = df[df['brand'].str.contains(brand_filter, case=False, na=False)]
-            
-            if product_filter and 'product_category' in df.columns:
-                df = df[df['product_category'].str.contains(product_filter, case=False, na=False)]
-            
-            # Limit results
-            df = df.head(limit)
-            
-            # Convert to list of dictionaries
-            results = []
-            for _, row in df.iterrows():
-                result = {
-                    "id": row.get("id", ""),
-                    "question": row.get("question", ""),
-                    "solution": row.get("solution", ""),
-                    "brand": row.get("brand", ""),
-                    "product_category": row.get("product_category", ""),
-                    "issue_category": row.get("issue_category", ""),
-                    "resolution_method": row.get("resolution_method", ""),
-                    "confidence_score": row.get("confidence_score", 0.8),
-                    "timestamp": row.get("timestamp", ""),
-                    "source_type": row.get("source_type", ""),
-                    "tags": row.get("tags", [])
-                }
-                results.append(result)
-            
-            return results
+            self._sync_search_matrix()
+            
+            # Restrict to rows matching the filters before scoring
+            candidates = np.arange(len(self._rows))
+            if brand_filter:
+                candidates = np.array([i for i in candidates
+                                       if brand_filter.lower() in str(self._rows[i].get('brand') or '').lower()], dtype=np.int64)
+            if product_filter:
+                candidates = np.array([i for i in candidates
+                                       if product_filter.lower() in str(self._rows[i].get('product_category') or '').lower()], dtype=np.int64)
+            
+            if len(candidates) == 0 or limit <= 0:
+                return []
+            
+            query_vector = self.embed_query(query).reshape(1, -1)
+            
+            # LSH prefilter: keep rows whose code is within lsh_max_distance bits, if enough remain
+            if self.use_lsh:
+                query_code = self._lsh_hash(query_vector)[0]
+                near = self._hamming_distance(self._lsh_codes[candidates], query_code) <= self.lsh_max_distance
+                if np.count_nonzero(near) >= limit:
+                    candidates = candidates[near]
+            
+            # Cosine similarity against every candidate in one matrix-vector product
+            query_vector = query_vector[0]
+            matrix = self._matrix if len(candidates) == len(self._rows) else self._matrix[candidates]
+            scores = matrix @ query_vector
+            
+            if len(scores) > limit:
+                top = np.argpartition(-scores, limit)[:limit]
+            else:
+                top = np.arange(len(scores))
+            top = top[np.argsort(-scores[top])]
+            
+            return [self._row_to_result(self._rows[i]) for i in candidates[top]]
             
         except Exception as e:
             print(f"❌ Error searching manual knowledge: {e}")
             return []
 
+    def search_batch(self, queries: List[str], limit: int = 5) -> List[List[Dict[str, Any]]]:
+        """Search manual knowledge for several queries with one embedding call and one matrix product"""
+        try:
+            self._sync_search_matrix()
+            if not queries or limit <= 0 or not self._rows:
+                return [[] for _ in queries]
+            
+            # Embed all uncached queries in one encoder call, then read every vector through the cache
+            keys = [query.strip().lower() for query in queries]
+            missing = list(dict.fromkeys(key for key in keys if key not in _query_embeddings))
+            if missing:
+                vectors = self._normalize_rows(np.asarray(self.encoder.encode(missing), dtype=np.float32).reshape(len(missing), -1))
+                _query_embeddings.put_many(missing, vectors)
+            query_matrix = np.vstack([self.embed_query(key) for key in keys])
+            
+            # (queries, rows) cosine scores, top-k per row
+            scores = query_matrix @ self._matrix.T
+            if scores.shape[1] > limit:
+                top = np.argpartition(-scores, limit, axis=1)[:, :limit]
+            else:
+                top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            
+            return [[self._row_to_result(self._rows[i]) for i in row] for row in top]
+            
+        except Exception as e:
+            print(f"❌ Error searching manual knowledge: {e}")
+            return [[] for _ in queries]
+    
+    @staticmethod
+    def _row_to_result(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a stored manual knowledge row as a search result"""
+        return {
+            "id": row.get("id", ""),
+            "question": row.get("question", ""),
+            "solution": row.get("solution", ""),
+            "brand": row.get("brand", ""),
+            "product_category": row.get("product_category", ""),
+            "issue_category": row.get("issue_category", ""),
+            "resolution_method": row.get("resolution_method", ""),
+            "confidence_score": row.get("confidence_score", 0.8),
+            "timestamp": row.get("timestamp", ""),
+            "source_type": row.get("source_type", ""),
+            "tags": row.get("tags", [])
+        }
+
     def get_manual_knowledge_stats(self) -> Dict[str, Any]:
         """Get statistics about manual knowledge base"""
         try:
@@ -336,6 +665,7 @@ class ManualKnowledgeManager:
         """Clear all manual knowledge entries"""
         try:
             self.table.delete("id != ''")
+            self._load_search_matrix()
             print("Manual knowledge base cleared")
             return True
         except Exception as e:
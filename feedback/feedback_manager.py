@@ -48,6 +48,49 @@ class FeedbackManager:
                                  feedback_details: Dict[str, Any]) -> str:
         """Log an unsatisfactory answer with manual correction"""
         
+        feedback_id, feedback_row = self._build_feedback_row(
+            user_question, original_answer, original_sources, manual_solution, support_agent, feedback_details
+        )
+        
+        # Append to CSV
+        with open(self.feedback_csv_path, 'a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(feedback_row)
+        
+        print(f"Feedback logged with ID: {feedback_id}")
+        return feedback_id
+    
+    def log_unsatisfactory_answers(self, items: List[Dict[str, Any]]) -> List[str]:
+        """Log several unsatisfactory answers with one CSV append; items take log_unsatisfactory_answer's arguments"""
+        built = [
+            self._build_feedback_row(
+                item['user_question'],
+                item['original_answer'],
+                item.get('original_sources', []),
+                item['manual_solution'],
+                item['support_agent'],
+                item.get('feedback_details', {})
+            )
+            for item in items
+        ]
+        
+        with open(self.feedback_csv_path, 'a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerows(row for _, row in built)
+        
+        feedback_ids = [feedback_id for feedback_id, _ in built]
+        for feedback_id in feedback_ids:
+            print(f"Feedback logged with ID: {feedback_id}")
+        return feedback_ids
+    
+    def _build_feedback_row(self,
+                            user_question: str,
+                            original_answer: str,
+                            original_sources: List[Dict[str, Any]],
+                            manual_solution: str,
+                            support_agent: str,
+                            feedback_details: Dict[str, Any]):
+        """Assign a feedback ID and build the CSV row for one feedback entry"""
         feedback_id = str(uuid.uuid4())
         timestamp = datetime.now().isoformat()
         
@@ -74,13 +117,7 @@ class FeedbackManager:
             feedback_details.get('notes', '')
         ]
         
-        # Append to CSV
-        with open(self.feedback_csv_path, 'a', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(feedback_row)
-        
-        print(f"Feedback logged with ID: {feedback_id}")
-        return feedback_id
+        return feedback_id, feedback_row
     
     def get_feedback_statistics(self) -> Dict[str, Any]:
         """Get statistics about feedback patterns"""
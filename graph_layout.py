@@ -0,0 +1,66 @@
+"""
+Force-directed graph layout compiled with Numba
+"""
+
+import os
+import numba
+import numpy as np
+
+# Compiled eagerly for this signature and cached on disk, so only the first run pays for compilation
+@numba.njit("float64[:,:](float64[:,:], int32[:,:], int64, float64)", parallel=True, cache=True, fastmath=True, boundscheck=False)
+def spring_layout(coords, edges, iterations, k):
+    """Fruchterman-Reingold layout of coords (N x 2) for int32 edges (E x 2), rescaled into [-1, 1]"""
+    n = coords.shape[0]
+    pos = coords.copy()
+    disp = np.zeros((n, 2))
+    t = 0.1
+    dt = t / (iterations + 1)
+
+    for _ in range(iterations):
+        # Repulsive forces between every pair of nodes; each row only writes its own disp, so rows run in parallel
+        for i in numba.prange(n):
+            fx = 0.0
+            fy = 0.0
+            for j in range(n):
+                if i == j:
+                    continue
+                dx = pos[i, 0] - pos[j, 0]
+                dy = pos[i, 1] - pos[j, 1]
+                dist_sq = max(dx * dx + dy * dy, 1e-4)
+                force = k * k / dist_sq
+                fx += dx * force
+                fy += dy * force
+            disp[i, 0] = fx
+            disp[i, 1] = fy
+
+        # Attractive forces along edges, kept serial since each edge updates both endpoints
+        for e in range(edges.shape[0]):
+            a = edges[e, 0]
+            b = edges[e, 1]
+            dx = pos[a, 0] - pos[b, 0]
+            dy = pos[a, 1] - pos[b, 1]
+            force = max(np.sqrt(dx * dx + dy * dy), 0.01) / k
+            disp[a, 0] -= dx * force
+            disp[a, 1] -= dy * force
+            disp[b, 0] += dx * force
+            disp[b, 1] += dy * force
+
+        # Move each node at most the current temperature, then cool down
+        for i in range(n):
+            length = max(np.sqrt(disp[i, 0] ** 2 + disp[i, 1] ** 2), 0.01)
+            pos[i, 0] += disp[i, 0] * t / length
+            pos[i, 1] += disp[i, 1] * t / length
+        t -= dt
+
+    # Center on the origin and scale the largest coordinate to 1
+    if n > 0:
+        pos[:, 0] -= pos[:, 0].mean()
+        pos[:, 1] -= pos[:, 1].mean()
+        limit = np.abs(pos).max()
+        if limit > 0:
+            pos /= limit
+    return pos
+
+if os.environ.get("VIZ_WARMUP"):
+    # Populate the on-disk cache ahead of the first real layout
+    spring_layout(np.zeros((2, 2)), np.zeros((1, 2), np.int32), 1, 1.0)
@@ -8,9 +8,11 @@ import os
 import sys
 import argparse
 from pathlib import Path
-from typing import Optional, Dict
+from dataclasses import asdict
+from typing import Optional
 
 from rag_engine.enhanced_query_engine import EnhancedQueryEngine
+from rag_engine.query_result import QueryResult
 from database.manual_knowledge_manager import ManualKnowledgeManager
 from feedback.feedback_manager import FeedbackManager
 from validation.answer_validator import AnswerValidator
@@ -109,17 +111,17 @@ def run_enhanced_cli_mode(enhanced_engine: EnhancedQueryEngine):
             )
             
             print(f"\n🤖 Answer:")
-            print(result['response'])
+            print(result.response)
             
             # Show confidence and validation info
-            confidence = result.get('confidence_indicators', {})
-            print(f"\n🎯 Confidence: {confidence.get('overall_confidence', 0.5):.1%}")
+            confidence = result.confidence_indicators
+            print(f"\n🎯 Confidence: {confidence.overall_confidence:.1%}")
             
-            if confidence.get('has_manual_solutions'):
+            if confidence.has_manual_solutions:
                 print("✅ Includes verified manual solutions from support agents")
             
             # Show validation results
-            validation = result.get('validation')
+            validation = result.validation
             if validation:
                 print(f"📊 Validation Score: {validation.get('overall_score', 0):.1%}")
                 if validation.get('is_valid'):
@@ -130,24 +132,23 @@ def run_enhanced_cli_mode(enhanced_engine: EnhancedQueryEngine):
                         print("💡 Suggestions: " + "; ".join(validation['suggestions']))
             
             # Show sources
-            total_sources = result.get('total_sources', 0)
+            total_sources = result.total_sources
             if total_sources > 0:
                 print(f"\n📚 Sources ({total_sources} total):")
                 
                 # Manual sources first
-                manual_sources = result.get('manual_sources', [])
+                manual_sources = result.manual_sources
                 if manual_sources:
                     print("  🔧 Manual Solutions:")
                     for i, source in enumerate(manual_sources[:2], 1):
-                        conf = source.get('confidence_score', 0)
-                        print(f"    {i}. {source['brand']} {source['product_category']} - {source['issue_category']} (Confidence: {conf:.1%})")
+                        print(f"    {i}. {source.brand} {source.product_category} - {source.issue_category} (Confidence: {source.confidence_score:.1%})")
                 
                 # Original documentation
-                original_sources = result.get('original_sources', [])
+                original_sources = result.original_sources
                 if original_sources:
                     print("  📖 Documentation:")
                     for i, source in enumerate(original_sources[:2], 1):
-                        print(f"    {i}. {source['brand']} {source['product_category']} - {source['document_type']}")
+                        print(f"    {i}. {source.brand} {source.product_category} - {source.document_type}")
             
             # Ask for feedback
             print(f"\n📝 Was this answer helpful? (y/n/s for 'add manual solution'): ", end='')
@@ -167,7 +168,7 @@ def run_enhanced_cli_mode(enhanced_engine: EnhancedQueryEngine):
     
     print("\n👋 Goodbye!")
 
-def collect_negative_feedback(enhanced_engine: EnhancedQueryEngine, question: str, result: Dict):
+def collect_negative_feedback(enhanced_engine: EnhancedQueryEngine, question: str, result: QueryResult):
     """Collect negative feedback about an answer"""
     print("\n📝 Feedback Collection:")
     issue_type = input("What was wrong? (incomplete/incorrect/irrelevant): ").strip()
@@ -176,7 +177,7 @@ def collect_negative_feedback(enhanced_engine: EnhancedQueryEngine, question: st
     # Log feedback for analysis
     print("📊 Feedback logged for system improvement")
 
-def collect_manual_solution(enhanced_engine: EnhancedQueryEngine, question: str, result: Dict):
+def collect_manual_solution(enhanced_engine: EnhancedQueryEngine, question: str, result: QueryResult):
     """Collect manual solution from support agent"""
     print("\n🔧 Manual Solution Entry:")
     agent_name = input("Support agent name: ").strip()
@@ -203,13 +204,13 @@ def collect_manual_solution(enhanced_engine: EnhancedQueryEngine, question: str,
         'notes': 'Entered via CLI',
         'feedback_type': 'manual_correction',
         'timestamp': datetime.now().isoformat(),
-        'original_sources': result.get('original_sources', [])
+        'original_sources': [asdict(source) for source in result.original_sources]
     }
     
     # Add to manual knowledge
     feedback_id = enhanced_engine.manual_knowledge.add_real_time_feedback(
         user_question=question,
-        original_answer=result['response'],
+        original_answer=result.response,
         manual_solution=manual_solution,
         support_agent=agent_name,
         metadata=metadata
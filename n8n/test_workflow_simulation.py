@@ -4,10 +4,25 @@ Simulate n8n workflow execution by making direct API calls
 This replicates what the simple_test_workflow.json would do
 """
 
-import requests
-import json
+import asyncio
+import time
+import httpx
+import orjson
 from datetime import datetime
 
+LANCEDB_API_URL = "http://127.0.0.1:8000"
+
+# One keep-alive connection pool shared by every search call
+_CLIENT = httpx.Client(base_url=LANCEDB_API_URL, timeout=10.0)
+
+def _format_ts(ns):
+    """ISO string for a time.time_ns() timestamp, built only when displayed"""
+    return datetime.fromtimestamp(ns / 1e9).isoformat()
+
+def _dumps_pretty(obj):
+    """Indented JSON text for display"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
 def simulate_webhook_input():
     """Simulate webhook input data"""
     return {
@@ -33,21 +48,30 @@ def extract_query(webhook_data):
 def lancedb_search(question_data):
     """Call LanceDB search - simulates LanceDB Search node"""
     try:
-        url = "http://127.0.0.1:8000/manual_search"
         payload = {"question": question_data["question"]}
         
         print(f"🔍 Searching LanceDB: {payload}")
         
-        response = requests.post(url, json=payload, timeout=10)
+        response = _CLIENT.post("/manual_search", json=payload)
         response.raise_for_status()
         
-        result = response.json()
-        print(f"✅ LanceDB Response: {json.dumps(result, indent=2)}")
+        result = orjson.loads(response.content)
+        print(f"✅ LanceDB Response: {_dumps_pretty(result)}")
         return result
     except Exception as e:
         print(f"❌ Error in LanceDB search: {e}")
         raise
 
+async def lancedb_search_many(questions):
+    """Issue several LanceDB searches concurrently over one async client"""
+    async with httpx.AsyncClient(base_url=LANCEDB_API_URL, timeout=10.0) as client:
+        responses = await asyncio.gather(
+            *(client.post("/manual_search", json={"question": question}) for question in questions)
+        )
+    for response in responses:
+        response.raise_for_status()
+    return [orjson.loads(response.content) for response in responses]
+
 def format_response(query, lancedb_response):
     """Format final response - simulates Format Response node"""
     try:
@@ -55,10 +79,10 @@ def format_response(query, lancedb_response):
             "success": True,
             "query": query,
             "lancedb_response": lancedb_response,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": time.time_ns()
         }
         
-        print(f"📦 Formatted Response: {json.dumps(final_response, indent=2)}")
+        print(f"📦 Formatted Response: {_dumps_pretty({**final_response, 'timestamp': _format_ts(final_response['timestamp'])})}")
         return final_response
     except Exception as e:
         print(f"❌ Error formatting response: {e}")
@@ -90,7 +114,7 @@ def main():
         # Step 5: Return Result (Simulated)
         print("\n5️⃣ Return Result")
         print("✅ Workflow executed successfully!")
-        print(f"🎯 Final Output: {json.dumps(final_result, indent=2)}")
+        print(f"🎯 Final Output: {_dumps_pretty({**final_result, 'timestamp': _format_ts(final_result['timestamp'])})}")
         
         return final_result
         
@@ -1,10 +1,17 @@
 from typing import List, Dict, Any, Optional, Tuple
-import openai
+import numpy as np
+import tiktoken
 from database.lancedb_manager import LanceDBManager
 from database.manual_knowledge_manager import ManualKnowledgeManager
 from validation.answer_validator import AnswerValidator
 from cognee_integration.cognee_manager import CogneeManager
-from config import OPENAI_API_KEY, MAX_TOKENS
+from rag_engine.query_result import QueryResult, SourceRef, ConfidenceIndicators
+from rag_engine.openai_client import get_openai_client
+from config import MAX_TOKENS
+
+# gpt-3.5-turbo context window and headroom kept for the system prompt and user query
+CONTEXT_WINDOW_TOKENS = 16384
+PROMPT_RESERVE_TOKENS = 1024
 
 class EnhancedQueryEngine:
     def __init__(self):
@@ -12,20 +19,18 @@ class EnhancedQueryEngine:
         self.manual_knowledge = ManualKnowledgeManager()
         self.validator = AnswerValidator()
         self.cognee_manager = CogneeManager()
+        self._encoder = tiktoken.encoding_for_model("gpt-3.5-turbo")
         
-        # Initialize OpenAI
-        if OPENAI_API_KEY:
-            openai.api_key = OPENAI_API_KEY
-            self.openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        else:
-            self.openai_client = None
+        # Initialize OpenAI (shared client and connection pool across engines)
+        self.openai_client = get_openai_client()
+        if not self.openai_client:
             print("Warning: OpenAI API key not set. Responses will be limited.")
     
     def query_with_validation(self, 
                             user_query: str, 
                             filters: Optional[Dict[str, str]] = None,
                             use_cognee: bool = False,
-                            validation_enabled: bool = True) -> Dict[str, Any]:
+                            validation_enabled: bool = True) -> QueryResult:
         """Enhanced query with validation and manual knowledge integration"""
         
         # Step 1: Search both knowledge bases
@@ -58,43 +63,41 @@ class EnhancedQueryEngine:
             )
         
         # Step 5: Prepare comprehensive result
-        result = {
-            "response": response,
-            "response_source": response_source,
-            "original_sources": self._format_sources(original_docs, "original"),
-            "manual_sources": self._format_sources(manual_docs, "manual"),
-            "total_sources": len(original_docs) + len(manual_docs),
-            "validation": validation_result,
-            "confidence_indicators": self._calculate_confidence_indicators(original_docs, manual_docs, validation_result)
-        }
-        
-        return result
+        return QueryResult(
+            response=response,
+            response_source=response_source,
+            original_sources=self._format_sources(original_docs, "original"),
+            manual_sources=self._format_sources(manual_docs, "manual"),
+            total_sources=len(original_docs) + len(manual_docs),
+            validation=validation_result,
+            confidence_indicators=self._calculate_confidence_indicators(original_docs, manual_docs, validation_result)
+        )
     
     def _combine_knowledge_sources(self, 
                                  original_docs: List[Dict[str, Any]], 
-                                 manual_docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Combine and prioritize knowledge from both sources"""
-        combined = []
+                                 manual_docs: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], str]]:
+        """Combine and prioritize knowledge from both sources
         
-        # Add manual knowledge first (higher priority for recent human-validated solutions)
-        for doc in manual_docs:
-            doc['knowledge_source'] = 'manual'
-            doc['priority_score'] = doc.get('confidence_score', 0.5) * 1.5  # Boost manual knowledge
-            combined.append(doc)
+        Returns (doc, knowledge_source) pairs without mutating the input docs.
+        """
+        scores = np.empty(len(manual_docs) + len(original_docs), dtype=np.float32)
         
-        # Add original knowledge
-        for doc in original_docs:
-            doc['knowledge_source'] = 'original'
-            doc['priority_score'] = 1.0 - doc.get('score', 0.5)  # Convert distance to similarity
-            combined.append(doc)
+        # Manual knowledge gets a boost (recent human-validated solutions)
+        scores[:len(manual_docs)] = 1.5 * np.array([doc.get('confidence_score', 0.5) for doc in manual_docs], dtype=np.float32)
+        # Convert original distance to similarity
+        scores[len(manual_docs):] = 1.0 - np.array([doc.get('score', 0.5) for doc in original_docs], dtype=np.float32)
         
-        # Sort by priority score
-        combined.sort(key=lambda x: x.get('priority_score', 0), reverse=True)
+        # Top 8 most relevant across both sources; stable sort keeps manual first on ties
+        top_idx = np.argsort(-scores, kind='stable')[:8]
         
-        return combined[:8]  # Top 8 most relevant across both sources
+        docs = manual_docs + original_docs
+        return [(docs[i], 'manual' if i < len(manual_docs) else 'original') for i in top_idx]
     
-    def _generate_enhanced_response(self, query: str, combined_context: List[Dict[str, Any]]) -> str:
+    def _generate_enhanced_response(self, query: str, combined_context: List[Tuple[Dict[str, Any], str]]) -> str:
         """Generate response using combined knowledge sources"""
+        if not combined_context:
+            return "I couldn't find relevant information in either knowledge base to answer your question."
+        
         if not self.openai_client:
             return self._generate_simple_response(combined_context)
         
@@ -143,15 +146,18 @@ Context from knowledge bases:
             print(f"OpenAI API error: {e}")
             return self._generate_simple_response(combined_context)
     
-    def _prepare_enhanced_context(self, combined_context: List[Dict[str, Any]]) -> str:
+    def _prepare_enhanced_context(self, combined_context: List[Tuple[Dict[str, Any], str]]) -> str:
         """Prepare enhanced context from combined sources"""
         if not combined_context:
             return "No relevant information found in either knowledge base."
         
+        # Docs arrive highest priority first, so stopping at the budget evicts the lowest-priority ones
+        token_budget = CONTEXT_WINDOW_TOKENS - PROMPT_RESERVE_TOKENS - MAX_TOKENS
+        separator_tokens = len(self._encoder.encode("\n---\n"))
+        used_tokens = 0
+        
         context_parts = []
-        for i, doc in enumerate(combined_context, 1):
-            source_type = doc.get('knowledge_source', 'unknown')
-            
+        for i, (doc, source_type) in enumerate(combined_context, 1):
             if source_type == 'manual':
                 # Format manual knowledge
                 source_info = f"[MANUAL SOLUTION {i} - Previously validated by support agents]"
@@ -170,11 +176,19 @@ Context from knowledge bases:
                 
                 content = doc.get('content', '')
             
-            context_parts.append(f"{source_info}\n{content}\n")
+            part = f"{source_info}\n{content}\n"
+            part_tokens = len(self._encoder.encode(part)) + (separator_tokens if context_parts else 0)
+            if used_tokens + part_tokens > token_budget:
+                break
+            used_tokens += part_tokens
+            context_parts.append(part)
+        
+        if not context_parts:
+            return "No relevant information found in either knowledge base."
         
         return "\n---\n".join(context_parts)
     
-    def _generate_simple_response(self, combined_context: List[Dict[str, Any]]) -> str:
+    def _generate_simple_response(self, combined_context: List[Tuple[Dict[str, Any], str]]) -> str:
         """Generate simple response when OpenAI is not available"""
         if not combined_context:
             return "I couldn't find relevant information to answer your question."
@@ -182,8 +196,8 @@ Context from knowledge bases:
         response = "Based on available information:\n\n"
         
         # Prioritize manual solutions
-        manual_solutions = [doc for doc in combined_context if doc.get('knowledge_source') == 'manual']
-        original_docs = [doc for doc in combined_context if doc.get('knowledge_source') == 'original']
+        manual_solutions = [doc for doc, source_type in combined_context if source_type == 'manual']
+        original_docs = [doc for doc, source_type in combined_context if source_type == 'original']
         
         if manual_solutions:
             response += "**Verified Solution (from support agent experience):**\n"
@@ -198,60 +212,60 @@ Context from knowledge bases:
         
         return response
     
-    def _format_sources(self, docs: List[Dict[str, Any]], source_type: str) -> List[Dict[str, Any]]:
+    def _format_sources(self, docs: List[Dict[str, Any]], source_type: str) -> List[SourceRef]:
         """Format source information for response"""
         sources = []
         for doc in docs:
             if source_type == "manual":
-                sources.append({
-                    "type": "manual_solution",
-                    "question": doc.get('question', ''),
-                    "brand": doc.get('brand', ''),
-                    "product_category": doc.get('product_category', ''),
-                    "issue_category": doc.get('issue_category', ''),
-                    "confidence_score": doc.get('confidence_score', 0),
-                    "timestamp": doc.get('timestamp', ''),
-                    "resolution_method": doc.get('resolution_method', '')
-                })
+                sources.append(SourceRef(
+                    type="manual_solution",
+                    question=doc.get('question', ''),
+                    brand=doc.get('brand', ''),
+                    product_category=doc.get('product_category', ''),
+                    issue_category=doc.get('issue_category', ''),
+                    confidence_score=doc.get('confidence_score', 0),
+                    timestamp=doc.get('timestamp', ''),
+                    resolution_method=doc.get('resolution_method', '')
+                ))
             else:
-                sources.append({
-                    "type": "original_documentation",
-                    "file_name": doc.get('file_name', ''),
-                    "brand": doc.get('brand', ''),
-                    "product_category": doc.get('product_category', ''),
-                    "document_type": doc.get('document_type', ''),
-                    "relevance_score": doc.get('score', 0)
-                })
+                sources.append(SourceRef(
+                    type="original_documentation",
+                    file_name=doc.get('file_name', ''),
+                    brand=doc.get('brand', ''),
+                    product_category=doc.get('product_category', ''),
+                    document_type=doc.get('document_type', ''),
+                    relevance_score=doc.get('score', 0)
+                ))
         return sources
     
     def _calculate_confidence_indicators(self, 
                                        original_docs: List[Dict[str, Any]], 
                                        manual_docs: List[Dict[str, Any]], 
-                                       validation_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+                                       validation_result: Optional[Dict[str, Any]]) -> ConfidenceIndicators:
         """Calculate confidence indicators for the response"""
-        indicators = {
-            "has_manual_solutions": len(manual_docs) > 0,
-            "manual_solution_confidence": max([doc.get('confidence_score', 0) for doc in manual_docs], default=0),
-            "original_docs_count": len(original_docs),
-            "total_sources": len(original_docs) + len(manual_docs),
-            "validation_score": validation_result.get('overall_score', 0) if validation_result else None,
-            "is_validated": validation_result.get('is_valid', False) if validation_result else None
-        }
+        indicators = ConfidenceIndicators(
+            has_manual_solutions=len(manual_docs) > 0,
+            manual_solution_confidence=max([doc.get('confidence_score', 0) for doc in manual_docs], default=0),
+            original_docs_count=len(original_docs),
+            total_sources=len(original_docs) + len(manual_docs),
+            validation_score=validation_result.get('overall_score', 0) if validation_result else None,
+            is_validated=validation_result.get('is_valid', False) if validation_result else None
+        )
         
         # Overall confidence calculation
         confidence = 0.5  # Base confidence
         
-        if indicators["has_manual_solutions"]:
+        if indicators.has_manual_solutions:
             confidence += 0.3  # Boost for manual solutions
-            confidence += indicators["manual_solution_confidence"] * 0.2
+            confidence += indicators.manual_solution_confidence * 0.2
         
-        if indicators["original_docs_count"] > 0:
-            confidence += min(indicators["original_docs_count"] * 0.1, 0.3)
+        if indicators.original_docs_count > 0:
+            confidence += min(indicators.original_docs_count * 0.1, 0.3)
         
-        if indicators["validation_score"]:
-            confidence = (confidence + indicators["validation_score"]) / 2
+        if indicators.validation_score:
+            confidence = (confidence + indicators.validation_score) / 2
         
-        indicators["overall_confidence"] = min(confidence, 1.0)
+        indicators.overall_confidence = min(confidence, 1.0)
         
         return indicators
     
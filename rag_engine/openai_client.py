@@ -0,0 +1,22 @@
+from functools import lru_cache
+from typing import Optional
+import openai
+from config import OPENAI_API_KEY
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> Optional[openai.OpenAI]:
+    """Get the process-wide OpenAI client, or None if no API key is set"""
+    if not OPENAI_API_KEY:
+        return None
+    
+    openai.api_key = OPENAI_API_KEY
+    return openai.OpenAI(api_key=OPENAI_API_KEY)
+
+# Not cached: an AsyncOpenAI connection pool is bound to the event loop that first uses it,
+# so each asyncio.run gets its own client and the caller closes it when done
+def create_async_openai_client() -> Optional[openai.AsyncOpenAI]:
+    """Create an async OpenAI client, or None if no API key is set"""
+    if not OPENAI_API_KEY:
+        return None
+    
+    return openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
@@ -1,20 +1,17 @@
 from typing import List, Dict, Any, Optional
-import openai
 from database.lancedb_manager import LanceDBManager
 from cognee_integration.cognee_manager import CogneeManager
-from config import OPENAI_API_KEY, MAX_TOKENS
+from rag_engine.openai_client import get_openai_client
+from config import MAX_TOKENS
 
 class RAGQueryEngine:
     def __init__(self):
         self.db_manager = LanceDBManager()
         self.cognee_manager = CogneeManager()
         
-        # Initialize OpenAI
-        if OPENAI_API_KEY:
-            openai.api_key = OPENAI_API_KEY
-            self.openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        else:
-            self.openai_client = None
+        # Initialize OpenAI (shared client and connection pool across engines)
+        self.openai_client = get_openai_client()
+        if not self.openai_client:
             print("Warning: OpenAI API key not set. Chat responses will be limited.")
     
     def search_knowledge_base(self, query: str, filters: Optional[Dict[str, str]] = None, limit: int = 5) -> List[Dict[str, Any]]:
@@ -29,6 +26,9 @@ class RAGQueryEngine:
             except Exception as e:
                 print(f"Cognee query failed: {e}, falling back to OpenAI")
         
+        if not context_docs:
+            return "I couldn't find relevant information in the knowledge base to answer your question."
+        
         if not self.openai_client:
             return self._generate_simple_response(context_docs)
         
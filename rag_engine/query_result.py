@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Any, Optional
+import orjson
+
+@dataclass(slots=True)
+class SourceRef:
+    """Reference to a document or manual solution used to answer a query"""
+    type: str
+    brand: str = ''
+    product_category: str = ''
+    # Manual solution fields
+    question: str = ''
+    issue_category: str = ''
+    confidence_score: float = 0.0
+    timestamp: str = ''
+    resolution_method: str = ''
+    # Original documentation fields
+    file_name: str = ''
+    document_type: str = ''
+    relevance_score: float = 0.0
+
+@dataclass(slots=True)
+class ConfidenceIndicators:
+    """Confidence signals derived from the retrieved sources and validation"""
+    has_manual_solutions: bool
+    manual_solution_confidence: float
+    original_docs_count: int
+    total_sources: int
+    validation_score: Optional[float] = None
+    is_validated: Optional[bool] = None
+    overall_confidence: float = 0.5
+
+@dataclass(slots=True)
+class QueryResult:
+    """Result of an enhanced query with validation"""
+    response: str
+    response_source: str
+    original_sources: List[SourceRef] = field(default_factory=list)
+    manual_sources: List[SourceRef] = field(default_factory=list)
+    total_sources: int = 0
+    validation: Optional[Dict[str, Any]] = None
+    confidence_indicators: Optional[ConfidenceIndicators] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the result to plain dicts"""
+        return asdict(self)
+
+    def to_json(self) -> bytes:
+        """Serialize the result to JSON bytes"""
+        return orjson.dumps(self, option=orjson.OPT_SERIALIZE_NUMPY)
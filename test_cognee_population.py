@@ -5,17 +5,31 @@ Test script to populate Cognee with sample data and verify everything works
 
 import sys
 import os
+import argparse
 import asyncio
+import time
 from pathlib import Path
 from datetime import datetime
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
 from cognee_integration.cognee_manager import CogneeManager
 
+# Brand and product category of each sample document
+DOCUMENT_METADATA = {
+    "samsung_tv_troubleshooting": ("Samsung", "TV"),
+    "lg_refrigerator_maintenance": ("LG", "Refrigerator"),
+    "samsung_washing_machine_guide": ("Samsung", "Washing Machine"),
+    "lg_speaker_setup": ("LG", "Speaker"),
+}
+
 def create_test_documents():
-    """Create sample documents for testing Cognee"""
+    """Create a single Parquet bundle of sample documents for testing Cognee"""
     
     # Create test documents directory
     test_dir = Path("test_cognee_documents")
@@ -156,139 +170,187 @@ Troubleshooting:
 """
     }
     
-    # Write documents to files
-    created_files = []
+    # Write all documents as one Parquet shard so Cognee ingests them in a single add
+    rows = []
     for filename, content in documents.items():
-        file_path = test_dir / filename
-        with open(file_path, 'w') as f:
-            f.write(content)
-        created_files.append(str(file_path))
-        print(f"📄 Created: {file_path}")
+        doc_id = Path(filename).stem
+        brand, category = DOCUMENT_METADATA[doc_id]
+        rows.append({"doc_id": doc_id, "content": content, "brand": brand, "category": category})
     
-    return created_files
+    bundle_path = test_dir / "bundle.parquet"
+    pq.write_table(pa.Table.from_pylist(rows), bundle_path)
+    print(f"📦 Created: {bundle_path} ({len(rows)} documents)")
+    
+    return str(bundle_path), len(rows)
+
+async def wait_for_document_count(cognee_manager: CogneeManager, target: int,
+                                  timeout: float = 30.0, max_delay: float = 1.0) -> int:
+    """Poll Cognee's document count with exponential backoff until it reaches target or times out"""
+    deadline = time.monotonic() + timeout
+    delay = 0.1
+    while True:
+        stats = cognee_manager.get_usage_statistics(max_age=0)
+        total_docs = stats.get('documents', {}).get('total_documents', 0)
+        if total_docs >= target or time.monotonic() >= deadline:
+            return total_docs
+        await asyncio.sleep(delay)
+        delay = min(delay * 1.5, max_delay)
 
-def test_cognee_population():
+async def test_cognee_population():
     """Test populating Cognee with documents and verify the data"""
+    out = []
+    emit = out.append
     
-    print("🧪 Testing Cognee Data Population")
-    print("=" * 50)
-    
-    # Initialize Cognee manager
-    print("🔧 Initializing Cognee Manager...")
-    cognee_manager = CogneeManager()
-    
-    # Get initial status
-    print("\n📊 Initial Cognee Status:")
-    initial_status = cognee_manager.get_status()
-    print(f"   Version: {initial_status.get('cognee_version', 'unknown')}")
-    
-    initial_stats = cognee_manager.get_usage_statistics()
-    initial_docs = initial_stats.get('documents', {}).get('total_documents', 0)
-    print(f"   Documents: {initial_docs}")
-    
-    # Create test documents
-    print("\n📝 Creating Test Documents...")
-    test_files = create_test_documents()
-    print(f"   Created {len(test_files)} test documents")
+    def write_section():
+        """Write the lines collected for the finished section in one call"""
+        if out:
+            sys.stdout.write("\n".join(out) + "\n")
+            sys.stdout.flush()
+            out.clear()
     
-    # Add documents to Cognee
-    print("\n🔄 Adding Documents to Cognee...")
     try:
-        success = cognee_manager.add_documents(test_files)
-        if success:
-            print("✅ Documents successfully added to Cognee!")
-        else:
-            print("❌ Failed to add documents to Cognee")
+        emit("🧪 Testing Cognee Data Population")
+        emit("=" * 50)
+        
+        # Initialize Cognee manager
+        emit("🔧 Initializing Cognee Manager...")
+        cognee_manager = CogneeManager()
+        
+        write_section()
+        
+        # Get initial status
+        emit("\n📊 Initial Cognee Status:")
+        initial_status = cognee_manager.get_status()
+        emit(f"   Version: {initial_status.get('cognee_version', 'unknown')}")
+        
+        initial_stats = cognee_manager.get_usage_statistics()
+        initial_docs = initial_stats.get('documents', {}).get('total_documents', 0)
+        emit(f"   Documents: {initial_docs}")
+        
+        write_section()
+        
+        # Create test documents
+        emit("\n📝 Creating Test Documents...")
+        bundle_path, doc_count = create_test_documents()
+        emit(f"   Created {doc_count} test documents")
+        
+        write_section()
+        
+        # Add documents to Cognee
+        emit("\n🔄 Adding Documents to Cognee...")
+        write_section()
+        try:
+            success = await cognee_manager.add_parquet_async(bundle_path)
+            if success:
+                emit("✅ Documents successfully added to Cognee!")
+            else:
+                emit("❌ Failed to add documents to Cognee")
+                return False
+        except Exception as e:
+            emit(f"❌ Error adding documents: {e}")
             return False
-    except Exception as e:
-        print(f"❌ Error adding documents: {e}")
-        return False
-    
-    # Wait a moment for processing
-    print("\n⏳ Waiting for Cognee to process documents...")
-    import time
-    time.sleep(3)
-    
-    # Verify documents were added
-    print("\n🔍 Verifying Documents in Cognee...")
-    updated_stats = cognee_manager.get_usage_statistics()
-    updated_docs = updated_stats.get('documents', {}).get('total_documents', 0)
-    
-    print(f"   Documents before: {initial_docs}")
-    print(f"   Documents after: {updated_docs}")
-    print(f"   Documents added: {updated_docs - initial_docs}")
-    
-    if updated_docs > initial_docs:
-        print("✅ Documents successfully populated in Cognee!")
-    else:
-        print("⚠️ Document count unchanged - checking database details...")
-    
-    # Check database details
-    print("\n🗄️ Database Information:")
-    db_info = cognee_manager._get_database_info()
-    
-    for db_type, info in db_info.items():
-        if info and 'size_mb' in info:
-            print(f"   {db_type.capitalize()} DB: {info['size_mb']} MB")
-    
-    # Test queries
-    print("\n🔍 Testing Queries...")
-    test_queries = [
-        "Samsung TV troubleshooting",
-        "LG refrigerator maintenance", 
-        "washing machine error codes",
-        "speaker setup instructions"
-    ]
-    
-    query_results = {}
-    for query in test_queries:
-        print(f"\n   Testing: '{query}'")
+        
+        write_section()
+        
+        # Verify documents were added
+        emit("\n🔍 Verifying Documents in Cognee...")
+        write_section()
+        updated_docs = await wait_for_document_count(cognee_manager, initial_docs + doc_count)
+        
+        # One SQLite connection for database info, statistics and table exploration
+        diagnostic = cognee_manager.get_full_diagnostic()
+        
+        emit(f"   Documents before: {initial_docs}")
+        emit(f"   Documents after: {updated_docs}")
+        emit(f"   Documents added: {updated_docs - initial_docs}")
+        
+        if updated_docs > initial_docs:
+            emit("✅ Documents successfully populated in Cognee!")
+        else:
+            emit("⚠️ Document count unchanged - checking database details...")
+        
+        write_section()
+        
+        # Check database details
+        emit("\n🗄️ Database Information:")
+        db_sizes = cognee_manager.get_database_sizes(diagnostic["db_info"])
+        
+        for db_type, size_mb in zip(db_sizes['names'], db_sizes['sizes_mb']):
+            emit(f"   {db_type.capitalize()} DB: {size_mb} MB")
+        emit(f"   Total: {db_sizes['sizes_mb'].sum():.2f} MB")
+        
+        write_section()
+        
+        # Test queries
+        emit("\n🔍 Testing Queries...")
+        write_section()
+        test_queries = [
+            "Samsung TV troubleshooting",
+            "LG refrigerator maintenance", 
+            "washing machine error codes",
+            "speaker setup instructions"
+        ]
+        
+        query_results = {}
         try:
-            result = cognee_manager.query(query)
+            results = await cognee_manager.query_batch_async(test_queries)
+        except Exception as e:
+            results = [f"Error: {e}"] * len(test_queries)
+        
+        for query, result in zip(test_queries, results):
+            emit(f"\n   Testing: '{query}'")
             query_results[query] = result
-            if result and "No relevant information found" not in result:
-                print(f"   ✅ Result: {result[:100]}...")
+            if result.startswith("Error"):
+                emit(f"   ❌ {result}")
+            elif result and "No relevant information found" not in result:
+                emit(f"   ✅ Result: {result[:100]}...")
             else:
-                print(f"   ⚠️ No results found")
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-            query_results[query] = f"Error: {e}"
-    
-    # Explore data structure
-    print("\n🔬 Exploring Cognee Data Structure...")
-    explorer_data = cognee_manager.explore_data()
-    
-    if 'error' not in explorer_data:
-        tables = explorer_data.get('tables', [])
-        print(f"   Found {len(tables)} tables in Cognee database")
+                emit(f"   ⚠️ No results found")
         
-        for table in tables[:5]:  # Show first 5 tables
-            print(f"   📋 Table: {table}")
-    else:
-        print(f"   ❌ Error exploring data: {explorer_data['error']}")
-    
-    # Final verification
-    print("\n📊 Final Verification:")
-    final_stats = cognee_manager.get_usage_statistics()
-    
-    if 'storage' in final_stats:
-        storage = final_stats['storage']
-        total_size = storage.get('total_size_mb', 0)
-        print(f"   Total Storage Used: {total_size} MB")
+        write_section()
+        
+        # Explore data structure
+        emit("\n🔬 Exploring Cognee Data Structure...")
+        explorer_data = diagnostic["explore"]
         
-        if total_size > 0:
-            print("✅ Cognee has data stored successfully!")
+        if 'error' not in explorer_data:
+            tables = explorer_data.get('tables', [])
+            emit(f"   Found {len(tables)} tables in Cognee database")
+            
+            if tables:
+                emit(pd.Series(tables, name="📋 Table").head(5).to_frame().to_string(index=False))  # First 5 tables
         else:
-            print("⚠️ No storage usage detected")
-    
-    # Summary
-    print("\n📋 Test Summary:")
-    print(f"   📄 Test Files Created: {len(test_files)}")
-    print(f"   🔄 Documents Processed: {'✅ Success' if success else '❌ Failed'}")
-    print(f"   📊 Database Tables: {len(tables) if 'tables' in locals() else 'Unknown'}")
-    print(f"   🔍 Queries Tested: {len([q for q in query_results.values() if 'Error' not in str(q)])}/{len(test_queries)}")
-    
-    return True
+            emit(f"   ❌ Error exploring data: {explorer_data['error']}")
+        
+        write_section()
+        
+        # Final verification
+        emit("\n📊 Final Verification:")
+        final_stats = diagnostic["stats"]
+        
+        if 'storage' in final_stats:
+            storage = final_stats['storage']
+            total_size = storage.get('total_size_mb', 0)
+            emit(f"   Total Storage Used: {total_size} MB")
+            
+            if total_size > 0:
+                emit("✅ Cognee has data stored successfully!")
+            else:
+                emit("⚠️ No storage usage detected")
+        
+        write_section()
+        
+        # Summary
+        emit("\n📋 Test Summary:")
+        emit(f"   📄 Test Documents Created: {doc_count}")
+        emit(f"   🔄 Documents Processed: {'✅ Success' if success else '❌ Failed'}")
+        emit(f"   📊 Database Tables: {len(tables) if 'tables' in locals() else 'Unknown'}")
+        emit(f"   🔍 Queries Tested: {len([q for q in query_results.values() if 'Error' not in str(q)])}/{len(test_queries)}")
+        
+        return True
+    finally:
+        # Whatever the current section collected is written even if a step raised
+        write_section()
 
 def cleanup_test_files():
     """Clean up test files"""
@@ -300,8 +362,12 @@ def cleanup_test_files():
 
 def main():
     """Main test function"""
+    parser = argparse.ArgumentParser(description="Populate Cognee with sample data and verify it")
+    parser.add_argument("--keep-files", action="store_true", help="Keep the generated test documents")
+    args = parser.parse_args()
+    
     try:
-        success = test_cognee_population()
+        success = asyncio.run(test_cognee_population())
         
         if success:
             print("\n🎉 Cognee population test completed!")
@@ -317,13 +383,7 @@ def main():
         traceback.print_exc()
     
     finally:
-        # Ask user if they want to keep test files
-        try:
-            keep_files = input("\n❓ Keep test documents? (y/N): ").lower().strip()
-            if keep_files != 'y':
-                cleanup_test_files()
-        except:
-            # If running in non-interactive mode, clean up
+        if not args.keep_files:
             cleanup_test_files()
 
 if __name__ == "__main__":
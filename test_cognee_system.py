@@ -7,6 +7,7 @@ Tests all working components without requiring OpenAI API
 import asyncio
 from pathlib import Path
 import sys
+import pandas as pd
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
@@ -15,36 +16,45 @@ from admin.raw_data_viewer import RawDataViewer
 from database.manual_knowledge_manager import ManualKnowledgeManager
 from cognee_integration.enhanced_cognee_manager import EnhancedCogneeManager
 
-def test_admin_system():
+# Fields every LanceDB knowledge base row is expected to carry
+REQUIRED_DOCUMENT_FIELDS = frozenset({'content', 'metadata', 'brand', 'product_category'})
+
+def test_admin_system(viewer=None, out=None):
     """Test admin system and database connections"""
-    print("🔧 Testing Admin System")
-    print("=" * 30)
+    emit = print if out is None else out.append  # Collect lines instead when run concurrently
+    
+    emit("🔧 Testing Admin System")
+    emit("=" * 30)
     
-    viewer = RawDataViewer()
+    viewer = viewer or RawDataViewer()
     
     # Test system overview
     overview = viewer.get_system_overview()
     
-    print(f"📊 System Statistics:")
+    emit(f"📊 System Statistics:")
     if 'system_stats' in overview:
         stats = overview['system_stats']
-        print(f"   Total Databases: {stats.get('total_databases', 0)}")
-        print(f"   Connected: {stats.get('connected_databases', 0)}")
-        print(f"   Storage: {stats.get('total_storage_mb', 0)} MB")
+        emit(f"   Total Databases: {stats.get('total_databases', 0)}")
+        emit(f"   Connected: {stats.get('connected_databases', 0)}")
+        emit(f"   Storage: {stats.get('total_storage_mb', 0)} MB")
     
-    print(f"\n🗄️ Database Status:")
-    for db_name, db_info in overview.items():
-        if isinstance(db_info, dict) and 'status' in db_info:
-            print(f"   {db_name}: {db_info['status']}")
+    emit(f"\n🗄️ Database Status:")
+    status = pd.DataFrame([{'database': db_name, 'status': db_info['status']}
+                           for db_name, db_info in overview.items()
+                           if isinstance(db_info, dict) and 'status' in db_info])
+    if not status.empty:
+        emit(status.to_string(index=False))
     
     return overview
 
-def test_manual_knowledge():
+def test_manual_knowledge(manual_kb=None, out=None):
     """Test manual knowledge database"""
-    print("\n🧠 Testing Manual Knowledge System")
-    print("=" * 35)
+    emit = print if out is None else out.append
+    
+    emit("\n🧠 Testing Manual Knowledge System")
+    emit("=" * 35)
     
-    manual_kb = ManualKnowledgeManager()
+    manual_kb = manual_kb or ManualKnowledgeManager()
     
     # Test search functionality
     test_queries = [
@@ -53,40 +63,44 @@ def test_manual_knowledge():
         "power outage"
     ]
     
-    for query in test_queries:
-        print(f"\n🔍 Searching: '{query}'")
-        results = manual_kb.search(query, limit=2)
+    all_results = manual_kb.search_batch(test_queries, limit=2)
+    for query, results in zip(test_queries, all_results):
+        emit(f"\n🔍 Searching: '{query}'")
         
         if results:
-            print(f"   ✅ Found {len(results)} results:")
+            emit(f"   ✅ Found {len(results)} results:")
             for result in results:
                 question = result.get('question', 'Unknown')
                 confidence = result.get('confidence_score', 0)
-                print(f"   - {question[:60]}... (confidence: {confidence:.1%})")
+                emit(f"   - {question[:60]}... (confidence: {confidence:.1%})")
         else:
-            print(f"   ❌ No results found")
+            emit(f"   ❌ No results found")
     
     # Test statistics
     stats = manual_kb.get_manual_knowledge_stats()
-    print(f"\n📊 Manual Knowledge Stats:")
-    print(f"   Total entries: {stats.get('total_manual_entries', 0)}")
-    print(f"   Recent entries: {stats.get('recent_entries', 0)}")
-    print(f"   Average confidence: {stats.get('avg_confidence_score', 0):.1%}")
+    emit(f"\n📊 Manual Knowledge Stats:")
+    emit(f"   Total entries: {stats.get('total_manual_entries', 0)}")
+    emit(f"   Recent entries: {stats.get('recent_entries', 0)}")
+    emit(f"   Average confidence: {stats.get('avg_confidence_score', 0):.1%}")
     
     return stats
 
-def test_cross_database_search():
+def test_cross_database_search(viewer=None, out=None):
     """Test cross-database search functionality"""
-    print("\n🔍 Testing Cross-Database Search")
-    print("=" * 35)
+    emit = print if out is None else out.append
     
-    viewer = RawDataViewer()
+    emit("\n🔍 Testing Cross-Database Search")
+    emit("=" * 35)
+    
+    viewer = viewer or RawDataViewer()
     
     test_terms = ["Samsung", "TV", "flickering"]
     
-    for term in test_terms:
-        print(f"\n🔎 Searching all databases for: '{term}'")
-        results = viewer.search_across_databases(term, limit=3)
+    # One pass over each database for all terms
+    all_results = viewer.search_across_databases_batch(test_terms, limit=3)
+    
+    for term, results in zip(test_terms, all_results):
+        emit(f"\n🔎 Searching all databases for: '{term}'")
         
         total_results = 0
         for db_name, db_results in results.items():
@@ -94,75 +108,78 @@ def test_cross_database_search():
                 count = len(db_results)
                 total_results += count
                 if count > 0:
-                    print(f"   {db_name}: {count} results")
+                    emit(f"   {db_name}: {count} results")
         
-        print(f"   📊 Total: {total_results} results across all databases")
+        emit(f"   📊 Total: {total_results} results across all databases")
     
     return results
 
-async def test_cognee_manager():
+async def test_cognee_manager(cognee_manager=None, out=None):
     """Test Cognee manager functionality"""
-    print("\n🧠 Testing Cognee AI Memory Engine")
-    print("=" * 35)
+    emit = print if out is None else out.append
     
-    cognee_manager = EnhancedCogneeManager()
+    emit("\n🧠 Testing Cognee AI Memory Engine")
+    emit("=" * 35)
+    
+    cognee_manager = cognee_manager or EnhancedCogneeManager()
     
     # Test status and info gathering
-    print("📊 Cognee System Status:")
+    emit("📊 Cognee System Status:")
     
     # Knowledge graph info
     graph_info = cognee_manager.get_knowledge_graph_info()
-    print(f"   Graph Status: {graph_info.get('status', 'Unknown')}")
-    print(f"   Graph Size: {graph_info.get('graph_size_mb', 0)} MB")
+    emit(f"   Graph Status: {graph_info.get('status', 'Unknown')}")
+    emit(f"   Graph Size: {graph_info.get('graph_size_mb', 0)} MB")
     
     # DataPoints info
     datapoints_info = cognee_manager.get_datapoints_info()
     if not datapoints_info.get('error'):
-        print(f"   DataPoints: {datapoints_info.get('total_datapoints', 0)}")
-        print(f"   DataPoint Tables: {len(datapoints_info.get('datapoint_tables', []))}")
+        emit(f"   DataPoints: {datapoints_info.get('total_datapoints', 0)}")
+        emit(f"   DataPoint Tables: {len(datapoints_info.get('datapoint_tables', []))}")
     
     # Memory statistics
     memory_stats = cognee_manager.get_memory_statistics()
     if not memory_stats.get('error'):
-        print("   ✅ Memory statistics available")
+        emit("   ✅ Memory statistics available")
         
         # Show integration status
         integration = memory_stats.get('ai_memory_engine', {}).get('integration_status', {})
         for system, status in integration.items():
-            print(f"   {system}: {status}")
+            emit(f"   {system}: {status}")
     else:
-        print(f"   ❌ Memory statistics error: {memory_stats.get('error')}")
+        emit(f"   ❌ Memory statistics error: {memory_stats.get('error')}")
     
     return memory_stats
 
-def test_data_quality():
+def test_data_quality(viewer=None, out=None):
     """Test data quality across databases"""
-    print("\n📊 Testing Data Quality")
-    print("=" * 25)
+    emit = print if out is None else out.append
+    
+    emit("\n📊 Testing Data Quality")
+    emit("=" * 25)
     
-    viewer = RawDataViewer()
+    viewer = viewer or RawDataViewer()
     
     # Test LanceDB data
     lancedb_data = viewer.get_lancedb_raw_data("knowledge_base", limit=5)
     if not lancedb_data.get('error') and lancedb_data.get('data'):
         table_data = lancedb_data['data']
-        print(f"📚 LanceDB Knowledge Base:")
-        print(f"   Total documents: {table_data.get('rows', 0)}")
-        print(f"   Sample documents: {len(table_data.get('sample_data', []))}")
+        emit(f"📚 LanceDB Knowledge Base:")
+        emit(f"   Total documents: {table_data.get('rows', 0)}")
+        emit(f"   Sample documents: {len(table_data.get('sample_data', []))}")
         
         # Check data completeness
         if table_data.get('sample_data'):
             sample = table_data['sample_data'][0]
-            required_fields = ['content', 'metadata', 'brand', 'product_category']
-            complete_fields = sum(1 for field in required_fields if field in sample)
-            print(f"   Data completeness: {complete_fields}/{len(required_fields)} fields")
+            complete_fields = len(REQUIRED_DOCUMENT_FIELDS & sample.keys())
+            emit(f"   Data completeness: {complete_fields}/{len(REQUIRED_DOCUMENT_FIELDS)} fields")
     
     # Test manual knowledge data quality
     manual_data = viewer.get_manual_knowledge_raw_data(limit=5)
     if not manual_data.get('error'):
-        print(f"\n🧠 Manual Knowledge:")
-        print(f"   Total solutions: {manual_data.get('total_rows', 0)}")
-        print(f"   Columns: {len(manual_data.get('columns', []))}")
+        emit(f"\n🧠 Manual Knowledge:")
+        emit(f"   Total solutions: {manual_data.get('total_rows', 0)}")
+        emit(f"   Columns: {len(manual_data.get('columns', []))}")
         
         # Check solution quality
         if manual_data.get('sample_data'):
@@ -172,13 +189,13 @@ def test_data_quality():
                 if '1.' in solution or 'Step' in solution:
                     solutions_with_steps += 1
             
-            print(f"   Detailed solutions: {solutions_with_steps}/{len(manual_data['sample_data'])}")
+            emit(f"   Detailed solutions: {solutions_with_steps}/{len(manual_data['sample_data'])}")
     
     # Test feedback data quality
     feedback_data = viewer.get_feedback_raw_data(limit=10)
     if not feedback_data.get('error'):
-        print(f"\n📝 Feedback Data:")
-        print(f"   Total feedback: {feedback_data.get('total_rows', 0)}")
+        emit(f"\n📝 Feedback Data:")
+        emit(f"   Total feedback: {feedback_data.get('total_rows', 0)}")
         
         if feedback_data.get('sample_data'):
             satisfied_feedback = 0
@@ -188,37 +205,51 @@ def test_data_quality():
                     satisfied_feedback += 1
             
             satisfaction_rate = satisfied_feedback / len(feedback_data['sample_data']) * 100
-            print(f"   Satisfaction rate: {satisfaction_rate:.1f}%")
+            emit(f"   Satisfaction rate: {satisfaction_rate:.1f}%")
+
+def _time_call_ms(fn, warmup: int = 5, repeat: int = 100, runs: int = 3) -> float:
+    """Best-of-runs mean time per call in milliseconds, after warmup calls"""
+    import time
+    
+    for _ in range(warmup):
+        fn()
+    
+    best_ns = None
+    for _ in range(runs):
+        start_ns = time.perf_counter_ns()
+        for _ in range(repeat):
+            fn()
+        elapsed_ns = (time.perf_counter_ns() - start_ns) / repeat
+        best_ns = elapsed_ns if best_ns is None else min(best_ns, elapsed_ns)
+    return best_ns / 1e6
 
-def test_system_performance():
+def test_system_performance(manual_kb=None, viewer=None, out=None):
     """Test system performance metrics"""
-    print("\n⚡ Testing System Performance")
-    print("=" * 30)
+    emit = print if out is None else out.append
     
-    import time
+    emit("\n⚡ Testing System Performance")
+    emit("=" * 30)
     
     # Test search performance
-    manual_kb = ManualKnowledgeManager()
+    manual_kb = manual_kb or ManualKnowledgeManager()
     
-    start_time = time.time()
     results = manual_kb.search("Samsung TV", limit=5)
-    search_time = time.time() - start_time
+    search_ms = _time_call_ms(lambda: manual_kb.search("Samsung TV", limit=5))
     
-    print(f"🔍 Search Performance:")
-    print(f"   Query time: {search_time*1000:.1f}ms")
-    print(f"   Results found: {len(results)}")
-    print(f"   Avg time per result: {search_time/max(len(results), 1)*1000:.1f}ms")
+    emit(f"🔍 Search Performance:")
+    emit(f"   Query time: {search_ms:.3f}ms")
+    emit(f"   Results found: {len(results)}")
+    emit(f"   Avg time per result: {search_ms/max(len(results), 1):.3f}ms")
     
-    # Test admin system performance
-    viewer = RawDataViewer()
+    # Test admin system performance (max_age=0 bypasses the overview cache so every call is timed)
+    viewer = viewer or RawDataViewer()
     
-    start_time = time.time()
-    overview = viewer.get_system_overview()
-    overview_time = time.time() - start_time
+    overview = viewer.get_system_overview(max_age=0)
+    overview_ms = _time_call_ms(lambda: viewer.get_system_overview(max_age=0), warmup=1, repeat=10)
     
-    print(f"\n📊 Admin Performance:")
-    print(f"   System overview time: {overview_time*1000:.1f}ms")
-    print(f"   Databases checked: {len([k for k, v in overview.items() if isinstance(v, dict) and 'status' in v])}")
+    emit(f"\n📊 Admin Performance:")
+    emit(f"   System overview time: {overview_ms:.3f}ms")
+    emit(f"   Databases checked: {len([k for k, v in overview.items() if isinstance(v, dict) and 'status' in v])}")
 
 async def main():
     """Run comprehensive test suite"""
@@ -228,50 +259,61 @@ async def main():
     print()
     
     try:
-        # Test 1: Admin System
-        admin_results = test_admin_system()
-        
-        # Test 2: Manual Knowledge
-        manual_results = test_manual_knowledge()
-        
-        # Test 3: Cross-Database Search
-        search_results = test_cross_database_search()
-        
-        # Test 4: Cognee Manager
-        cognee_results = await test_cognee_manager()
-        
-        # Test 5: Data Quality
-        test_data_quality()
-        
-        # Test 6: Performance
-        test_system_performance()
-        
-        # Summary
-        print("\n" + "=" * 60)
-        print("🎯 TEST SUMMARY")
-        print("=" * 60)
+        # Create the shared managers up front: constructing them concurrently races on
+        # opening/creating the same LanceDB tables
+        viewer = RawDataViewer()
+        manual_kb = ManualKnowledgeManager()
+        cognee_manager = EnhancedCogneeManager()
         
-        print("✅ WORKING COMPONENTS:")
-        print("   🔧 Admin Panel - Full database access and monitoring")
-        print("   🧠 Manual Knowledge - Search and statistics")
-        print("   🔍 Cross-Database Search - Find data across all systems")
-        print("   📊 Cognee Integration - Memory engine status and info")
-        print("   📈 Data Quality - Complete data with good structure")
-        print("   ⚡ Performance - Fast search and admin operations")
+        # Tests 1-5 are independent reads, so run them concurrently; each collects its own
+        # output lines, which are printed in order once all have finished
+        outputs = [[] for _ in range(5)]
+        outcomes = await asyncio.gather(
+            asyncio.to_thread(test_admin_system, viewer, outputs[0]),
+            asyncio.to_thread(test_manual_knowledge, manual_kb, outputs[1]),
+            asyncio.to_thread(test_cross_database_search, viewer, outputs[2]),
+            test_cognee_manager(cognee_manager, outputs[3]),
+            asyncio.to_thread(test_data_quality, viewer, outputs[4]),
+            return_exceptions=True
+        )
         
-        print("\n⚠️ REQUIRES SETUP:")
-        print("   🔑 OpenAI API Key - For AI response generation")
-        print("   📄 Document Processing - For full Cognee memory creation")
+        sys.stdout.write("".join(line + "\n" for lines in outputs for line in lines))
+        for result in outcomes:
+            if isinstance(result, Exception):
+                raise result
         
-        print("\n🌐 WEB INTERFACES AVAILABLE:")
-        print("   📱 Main App: http://localhost:8505 (Cognee-Enhanced)")
-        print("   🔧 Admin: Included in main app tabs")
+        # Test 6: Performance (run alone so timings aren't skewed by the concurrent tests)
+        test_system_performance(manual_kb, viewer)
         
-        print("\n🎉 SYSTEM STATUS: EXCELLENT")
-        print("   - All core databases connected and populated")
-        print("   - Manual knowledge system fully functional")
-        print("   - Admin tools provide complete system visibility")
-        print("   - Ready for AI-powered responses with API key")
+        # Summary, written in one call
+        sys.stdout.write("\n".join([
+            "",
+            "=" * 60,
+            "🎯 TEST SUMMARY",
+            "=" * 60,
+            "✅ WORKING COMPONENTS:",
+            "   🔧 Admin Panel - Full database access and monitoring",
+            "   🧠 Manual Knowledge - Search and statistics",
+            "   🔍 Cross-Database Search - Find data across all systems",
+            "   📊 Cognee Integration - Memory engine status and info",
+            "   📈 Data Quality - Complete data with good structure",
+            "   ⚡ Performance - Fast search and admin operations",
+            "",
+            "⚠️ REQUIRES SETUP:",
+            "   🔑 OpenAI API Key - For AI response generation",
+            "   📄 Document Processing - For full Cognee memory creation",
+            "",
+            "🌐 WEB INTERFACES AVAILABLE:",
+            "   📱 Main App: http://localhost:8505 (Cognee-Enhanced)",
+            "   🔧 Admin: Included in main app tabs",
+            "",
+            "🎉 SYSTEM STATUS: EXCELLENT",
+            "   - All core databases connected and populated",
+            "   - Manual knowledge system fully functional",
+            "   - Admin tools provide complete system visibility",
+            "   - Ready for AI-powered responses with API key",
+        ]) + "\n")
+        sys.stdout.flush()
         
     except Exception as e:
         print(f"\n❌ Test failed: {e}")
@@ -6,19 +6,24 @@ Comprehensive test of enhanced RAG features:
 3. Manual knowledge integration
 """
 
-from rag_engine.enhanced_query_engine import EnhancedQueryEngine
-from feedback.feedback_manager import FeedbackManager
-from database.manual_knowledge_manager import ManualKnowledgeManager
-from validation.answer_validator import AnswerValidator
-from sample_data.create_sample_data import create_sample_data
 from datetime import datetime
 
 def test_enhanced_features():
     print("🧪 Enhanced RAG Features Test")
     print("=" * 60)
     
+    # Heavy imports (LanceDB, OpenAI SDK, sentence-transformers) are deferred until the test runs
+    from rag_engine.enhanced_query_engine import EnhancedQueryEngine
+    from feedback.feedback_manager import FeedbackManager
+    from database.manual_knowledge_manager import ManualKnowledgeManager
+    from validation.answer_validator import AnswerValidator
+    from sample_data.create_sample_data import create_sample_data
+    from processors.document_processor import DocumentProcessor
+    
     # Step 1: Initialize all components
     print("\n1. 🚀 Initializing Enhanced Components...")
+    # Constructed one after another: the engine, feedback and manual managers create the
+    # same LanceDB tables and feedback CSV on a fresh install, which is not safe to race
     enhanced_engine = EnhancedQueryEngine()
     feedback_manager = FeedbackManager()
     manual_knowledge = ManualKnowledgeManager()
@@ -32,7 +37,6 @@ def test_enhanced_features():
     # Check if we need to load data
     doc_count = enhanced_engine.db_manager.get_document_count()
     if doc_count == 0:
-        from processors.document_processor import DocumentProcessor
         processor = DocumentProcessor()
         docs = processor.process_directory(str(sample_dir))
         enhanced_engine.db_manager.add_documents(docs)
@@ -46,11 +50,11 @@ def test_enhanced_features():
     result = enhanced_engine.query_with_validation(test_query, validation_enabled=True)
     
     print(f"Query: {test_query}")
-    print(f"Response: {result['response'][:200]}...")
-    print(f"Confidence: {result['confidence_indicators']['overall_confidence']:.1%}")
-    print(f"Validation Score: {result['validation']['overall_score']:.1%}")
-    print(f"Valid: {'✅' if result['validation']['is_valid'] else '❌'}")
-    print(f"Sources: {result['total_sources']} (Original: {len(result['original_sources'])}, Manual: {len(result['manual_sources'])})")
+    print(f"Response: {result.response[:200]}...")
+    print(f"Confidence: {result.confidence_indicators.overall_confidence:.1%}")
+    print(f"Validation Score: {result.validation['overall_score']:.1%}")
+    print(f"Valid: {'✅' if result.validation['is_valid'] else '❌'}")
+    print(f"Sources: {result.total_sources} (Original: {len(result.original_sources)}, Manual: {len(result.manual_sources)})")
     
     # Step 4: Test feedback logging
     print("\n4. 📝 Testing Feedback Logging...")
@@ -97,18 +101,18 @@ def test_enhanced_features():
     result_2 = enhanced_engine.query_with_validation(test_query_2, validation_enabled=True)
     
     print(f"Query: {test_query_2}")
-    print(f"Response: {result_2['response'][:300]}...")
-    print(f"Confidence: {result_2['confidence_indicators']['overall_confidence']:.1%}")
-    print(f"Has Manual Solutions: {'✅' if result_2['confidence_indicators']['has_manual_solutions'] else '❌'}")
-    print(f"Manual Solution Confidence: {result_2['confidence_indicators']['manual_solution_confidence']:.1%}")
-    print(f"Sources: {result_2['total_sources']} (Original: {len(result_2['original_sources'])}, Manual: {len(result_2['manual_sources'])})")
+    print(f"Response: {result_2.response[:300]}...")
+    print(f"Confidence: {result_2.confidence_indicators.overall_confidence:.1%}")
+    print(f"Has Manual Solutions: {'✅' if result_2.confidence_indicators.has_manual_solutions else '❌'}")
+    print(f"Manual Solution Confidence: {result_2.confidence_indicators.manual_solution_confidence:.1%}")
+    print(f"Sources: {result_2.total_sources} (Original: {len(result_2.original_sources)}, Manual: {len(result_2.manual_sources)})")
     
-    if result_2['manual_sources']:
+    if result_2.manual_sources:
         print("\n🔧 Manual Solutions Found:")
-        for i, source in enumerate(result_2['manual_sources'], 1):
-            print(f"  {i}. Issue: {source['issue_category']}")
-            print(f"     Confidence: {source['confidence_score']:.1%}")
-            print(f"     Method: {source['resolution_method']}")
+        for i, source in enumerate(result_2.manual_sources, 1):
+            print(f"  {i}. Issue: {source.issue_category}")
+            print(f"     Confidence: {source.confidence_score:.1%}")
+            print(f"     Method: {source.resolution_method}")
     
     # Step 7: Test validation system
     print("\n7. 📊 Testing Validation System...")
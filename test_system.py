@@ -3,14 +3,16 @@
 Test script to demonstrate the RAG Knowledge Base functionality
 """
 
-from database.lancedb_manager import LanceDBManager
-from processors.document_processor import DocumentProcessor
-from sample_data.create_sample_data import create_sample_data
 
 def test_system():
     print("🔧 RAG Knowledge Base - System Test")
     print("=" * 50)
     
+    # Heavy imports (LanceDB, sentence-transformers) are deferred until the test runs
+    from database.lancedb_manager import LanceDBManager
+    from processors.document_processor import DocumentProcessor
+    from sample_data.create_sample_data import create_sample_data
+    
     # 1. Initialize components
     print("\n1. 🚀 Initializing components...")
     db_manager = LanceDBManager()
@@ -1,11 +1,32 @@
 import re
+import copy
+import asyncio
+import hashlib
+import functools
+import orjson
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional
-from openai import OpenAI
-from config import OPENAI_API_KEY
+from config import VECTOR_DIMENSION
+from rag_engine.openai_client import get_openai_client, create_async_openai_client
+from cognee_integration.semantic_cache import SemanticCache
+from cognee_integration.embedder import get_embedder
+
+@functools.lru_cache(maxsize=1024)
+def _embed_text(text: str):
+    """Unit-norm MiniLM embedding of a text, cached for repeated questions and answers"""
+    return get_embedder().encode(text, normalize_embeddings=True)
+
+# Instruction sent with every JSON-mode validation request
+_JSON_SYSTEM_MESSAGE = "You are an expert technical support validator. Return ONLY valid JSON."
 
 class AnswerValidator:
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+    # Accuracy heuristics, compiled once per process
+    _RE_STEPS = re.compile(r'\d+\.|step \d+|first|second|then|next|finally')
+    # Plain substrings, so a C-level `in` test replaces a regex scan
+    _TECH_TERMS = frozenset({'settings', 'menu', 'button', 'error', 'code', 'temperature', 'mode'})
+    
+    def __init__(self, cache_size: int = 1024, semantic_threshold: float = 0.9):
+        self.openai_client = get_openai_client()
         
         # Define validation criteria
         self.validation_criteria = {
@@ -13,31 +34,171 @@ class AnswerValidator:
             'accuracy': 0.4,      # Is the information technically correct?
             'relevance': 0.3      # Is it relevant to the specific product/issue?
         }
+        
+        # With these weights basic checks score in [0.29, 0.82]. Below low the answer is clearly weak
+        # (off-topic, no context), at or above high it already passes the 0.7 validity bar;
+        # only scores in [low, high) go to the LLM
+        self.ai_escalation_thresholds = (0.45, 0.7)
+        
+        # Exact-match cache of validation results, keyed by a digest of question, answer and context ids
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        
+        # Near-duplicate cache keyed by the (question, answer) embedding; only used in front of the LLM.
+        # Entries carry the context digest and only hit for the same context documents
+        self._semantic_cache = SemanticCache(VECTOR_DIMENSION, threshold=semantic_threshold, max_size=cache_size)
+        self._semantic_hits = 0
     
     def validate_answer(self, question: str, answer: str, context_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Validate an answer against multiple criteria"""
-        validation_result = {
-            'overall_score': 0.0,
-            'is_valid': False,
-            'criteria_scores': {},
-            'validation_details': {},
-            'suggestions': []
-        }
+        key, context_key, pair_embedding, cached = self._lookup_cached(question, answer, context_docs)
+        if cached is not None:
+            return cached
+        
+        validation_result = self._new_validation_result()
         
-        # Basic validation checks
+        # Basic checks first; AI-powered validation (if OpenAI available) only when they are inconclusive
         basic_checks = self._perform_basic_checks(question, answer, context_docs)
+        if self.openai_client and self._needs_ai_validation(basic_checks):
+            validation_result.update(self._perform_ai_validation(question, answer, context_docs))
+        else:
+            validation_result.update(basic_checks)
         
-        # Advanced AI-powered validation (if OpenAI available)
-        if self.openai_client:
-            ai_validation = self._perform_ai_validation(question, answer, context_docs)
-            validation_result.update(ai_validation)
+        return self._store_validation(key, context_key, pair_embedding, validation_result)
+    
+    async def validate_answer_async(self, question: str, answer: str, context_docs: List[Dict[str, Any]],
+                                    async_client=None) -> Dict[str, Any]:
+        """Validate an answer without blocking the event loop, on async_client or a client opened for this call"""
+        key, context_key, pair_embedding, cached = await self._lookup_cached_async(question, answer, context_docs)
+        if cached is not None:
+            return cached
+        
+        validation_result = self._new_validation_result()
+        
+        basic_checks = await asyncio.to_thread(self._perform_basic_checks, question, answer, context_docs)
+        if self.openai_client and self._needs_ai_validation(basic_checks):
+            validation_result.update(await self._perform_ai_validation_async(async_client, question, answer, context_docs))
         else:
             validation_result.update(basic_checks)
         
-        # Calculate overall score
+        return self._store_validation(key, context_key, pair_embedding, validation_result)
+    
+    def _needs_ai_validation(self, basic_checks: Dict[str, Any]) -> bool:
+        """True when the basic-check score falls inside the escalation band"""
+        low, high = self.ai_escalation_thresholds
+        return low <= self._calculate_overall_score(basic_checks['criteria_scores']) < high
+    
+    def _lookup_cached(self, question: str, answer: str, context_docs: List[Dict[str, Any]]):
+        """Check the exact and semantic caches; returns (key, context key, pair embedding or None, cached result or None)"""
+        key, context_key, cached = self._lookup_exact(question, answer, context_docs)
+        if cached is not None:
+            return key, context_key, None, cached
+        
+        # Paraphrased repeats skip the LLM round trip; basic checks are cheaper than an embedding
+        pair_embedding = None
+        if self.openai_client:
+            pair_embedding = self._embed_pair(question, answer)
+            cached = self._lookup_semantic(context_key, pair_embedding)
+        
+        return key, context_key, pair_embedding, cached
+    
+    async def _lookup_cached_async(self, question: str, answer: str, context_docs: List[Dict[str, Any]]):
+        """_lookup_cached with only the embedding offloaded; the caches are touched on the event loop thread"""
+        key, context_key, cached = self._lookup_exact(question, answer, context_docs)
+        if cached is not None:
+            return key, context_key, None, cached
+        
+        pair_embedding = None
+        if self.openai_client:
+            pair_embedding = await asyncio.to_thread(self._embed_pair, question, answer)
+            cached = self._lookup_semantic(context_key, pair_embedding)
+        
+        return key, context_key, pair_embedding, cached
+    
+    def _lookup_exact(self, question: str, answer: str, context_docs: List[Dict[str, Any]]):
+        """Exact-cache lookup; returns (key, context key, cached result or None)"""
+        context_key = self._context_key(context_docs)
+        key = self._cache_key(question, answer, context_key)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return key, context_key, copy.deepcopy(cached)
+        self._misses += 1
+        return key, context_key, None
+    
+    def _lookup_semantic(self, context_key: bytes, pair_embedding) -> Optional[Dict[str, Any]]:
+        """Semantic-cache lookup for a near-duplicate question and answer"""
+        similar = self._semantic_cache.get(pair_embedding)
+        # Relevance and the LLM prompt depend on the context, so a paraphrase only counts for the same documents
+        if similar is not None and similar[0] == context_key:
+            self._semantic_hits += 1
+            return copy.deepcopy(similar[1])
+        return None
+    
+    @staticmethod
+    def _embed_pair(question: str, answer: str):
+        return get_embedder().encode(f"{question}\n{answer}")
+    
+    def _store_validation(self, key: bytes, context_key: bytes, pair_embedding,
+                          validation_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Score a validation result and remember it in both caches"""
+        validation_result = self._score_validation(validation_result)
+        self._cache[key] = copy.deepcopy(validation_result)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        if pair_embedding is not None:
+            self._semantic_cache.put(pair_embedding, (context_key, copy.deepcopy(validation_result)))
+        return validation_result
+    
+    @staticmethod
+    def _new_validation_result() -> Dict[str, Any]:
+        return {
+            'overall_score': 0.0,
+            'is_valid': False,
+            'criteria_scores': {},
+            'validation_details': {},
+            'suggestions': []
+        }
+    
+    @staticmethod
+    def _context_key(context_docs: List[Dict[str, Any]]) -> bytes:
+        """BLAKE2b digest of the sorted context document ids (content if no id)"""
+        doc_ids = sorted(str(doc.get('id') or doc.get('content', '')).encode() for doc in context_docs)
+        return hashlib.blake2b(b"\x00".join(doc_ids), digest_size=16).digest()
+    
+    @staticmethod
+    def _cache_key(question: str, answer: str, context_key: bytes) -> bytes:
+        """BLAKE2b digest of the question, answer and context digest"""
+        payload = f"{question}\x00{answer}\x00".encode() + context_key
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the validation cache"""
+        lookups = self._hits + self._misses
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'semantic_hits': self._semantic_hits,
+            'size': len(self._cache),
+            'semantic_size': len(self._semantic_cache),
+            'hit_rate': (self._hits + self._semantic_hits) / lookups if lookups else 0.0
+        }
+    
+    def clear_cache(self):
+        """Drop all cached validation results"""
+        self._cache.clear()
+        self._semantic_cache.clear()
+        self._hits = 0
+        self._misses = 0
+        self._semantic_hits = 0
+    
+    def _score_validation(self, validation_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in the overall score and validity from the criteria scores"""
         validation_result['overall_score'] = self._calculate_overall_score(validation_result['criteria_scores'])
         validation_result['is_valid'] = validation_result['overall_score'] >= 0.7  # 70% threshold
-        
         return validation_result
     
     def _perform_basic_checks(self, question: str, answer: str, context_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -46,27 +207,38 @@ class AnswerValidator:
         validation_details = {}
         suggestions = []
         
-        # Completeness check
-        question_words = set(re.findall(r'\w+', question.lower()))
-        answer_words = set(re.findall(r'\w+', answer.lower()))
-        overlap = len(question_words.intersection(answer_words)) / len(question_words) if question_words else 0
-        criteria_scores['completeness'] = min(overlap * 2, 1.0)  # Scale to 0-1
+        answer_lower = answer.lower()
+        
+        # Completeness check: cosine similarity of the question and answer embeddings
+        if question.strip() and answer.strip():
+            similarity = float(_embed_text(question) @ _embed_text(answer))
+            criteria_scores['completeness'] = min(max(similarity, 0.0), 1.0)
+        else:
+            criteria_scores['completeness'] = 0.0
         
         # Relevance check (based on context)
         if context_docs:
-            context_brands = [doc.get('brand', '').lower() for doc in context_docs if doc.get('brand')]
-            context_products = [doc.get('product_category', '').lower() for doc in context_docs if doc.get('product_category')]
+            # One pass over the documents, deduplicating brands and products
+            context_brands = set()
+            context_products = set()
+            for doc in context_docs:
+                brand = doc.get('brand')
+                if brand:
+                    context_brands.add(brand.lower())
+                product = doc.get('product_category')
+                if product:
+                    context_products.add(product.lower())
             
-            brand_mentioned = any(brand in answer.lower() for brand in context_brands if brand)
-            product_mentioned = any(product in answer.lower() for product in context_products if product)
+            brand_mentioned = any(brand in answer_lower for brand in context_brands)
+            product_mentioned = any(product in answer_lower for product in context_products)
             
             criteria_scores['relevance'] = 0.8 if (brand_mentioned and product_mentioned) else 0.5
         else:
             criteria_scores['relevance'] = 0.3
         
         # Accuracy check (basic heuristics)
-        has_steps = bool(re.search(r'\d+\.|step \d+|first|second|then|next|finally', answer.lower()))
-        has_specific_info = bool(re.search(r'settings|menu|button|error|code|temperature|mode', answer.lower()))
+        has_specific_info = any(term in answer_lower for term in self._TECH_TERMS)
+        has_steps = has_specific_info and self._RE_STEPS.search(answer_lower) is not None
         criteria_scores['accuracy'] = 0.7 if (has_steps and has_specific_info) else 0.5
         
         # Generate suggestions
@@ -86,11 +258,47 @@ class AnswerValidator:
     def _perform_ai_validation(self, question: str, answer: str, context_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Perform AI-powered validation"""
         try:
-            # Prepare context information
-            context_summary = self._summarize_context(context_docs)
+            response = self.openai_client.chat.completions.create(
+                **self._validation_request(question, answer, context_docs)
+            )
+            ai_result = self._parse_ai_validation(response.choices[0].message.content)
+            if ai_result is None:
+                return self._perform_basic_checks(question, answer, context_docs)
+            return ai_result
+            
+        except Exception as e:
+            print(f"AI validation failed: {e}")
+            return self._perform_basic_checks(question, answer, context_docs)
+    
+    async def _perform_ai_validation_async(self, async_client, question: str, answer: str, context_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Perform AI-powered validation with async_client, or a client opened and closed for this call if None"""
+        owned_client = create_async_openai_client() if async_client is None else None
+        try:
+            client = async_client or owned_client
+            if client is not None:
+                response = await client.chat.completions.create(
+                    **self._validation_request(question, answer, context_docs)
+                )
+                ai_result = self._parse_ai_validation(response.choices[0].message.content)
+                if ai_result is not None:
+                    return ai_result
             
-            # Create validation prompt
-            validation_prompt = f"""
+        except Exception as e:
+            print(f"AI validation failed: {e}")
+        finally:
+            if owned_client is not None:
+                await owned_client.close()
+        
+        # The basic-check fallback runs in a worker thread
+        return await asyncio.to_thread(self._perform_basic_checks, question, answer, context_docs)
+    
+    def _validation_request(self, question: str, answer: str, context_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Chat completion arguments for validating one answer"""
+        # Prepare context information
+        context_summary = self._summarize_context(context_docs)
+        
+        # Create validation prompt
+        validation_prompt = f"""
 You are an expert technical support validator. Evaluate the following customer support answer:
 
 CUSTOMER QUESTION: {question}
@@ -123,35 +331,124 @@ Respond in this exact JSON format:
     "suggestions": ["suggestion 1", "suggestion 2"]
 }}
 """
+        
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [
+                {"role": "system", "content": _JSON_SYSTEM_MESSAGE},
+                {"role": "user", "content": validation_prompt}
+            ],
+            "temperature": 0.1,
+            "response_format": {"type": "json_object"}
+        }
+    
+    def _parse_ai_validation(self, content: str) -> Optional[Dict[str, Any]]:
+        """Parse a JSON-mode validation response; None if it doesn't have the expected shape"""
+        ai_result = orjson.loads(content.encode())
+        if not self._is_valid_ai_result(ai_result):
+            print("AI validation returned an unexpected shape, using basic checks")
+            return None
+        return ai_result
+    
+    def _perform_ai_validation_batch(self, qa_pairs: List[Dict[str, Any]], batch_size: int = 8) -> List[Dict[str, Any]]:
+        """AI validation of several QA pairs, packing up to batch_size pairs into each request"""
+        results = []
+        for start in range(0, len(qa_pairs), batch_size):
+            chunk = qa_pairs[start:start + batch_size]
+            try:
+                items = "\n".join(
+                    f"""
+ITEM {index}
+CUSTOMER QUESTION: {qa_pair['question']}
+PROPOSED ANSWER: {qa_pair['answer']}
+AVAILABLE CONTEXT: {self._summarize_context(qa_pair.get('context_docs', []))}
+"""
+                    for index, qa_pair in enumerate(chunk)
+                )
+                
+                validation_prompt = f"""
+You are an expert technical support validator. Evaluate each of the following customer support answers:
+{items}
+Rate each answer on these criteria (0.0 to 1.0):
+1. COMPLETENESS: Does it fully answer the customer's question?
+2. ACCURACY: Is the technical information correct and reliable?
+3. RELEVANCE: Is it specific to the mentioned product/brand/issue?
+
+Also provide, for each answer:
+- Specific validation details for each criterion
+- Actionable suggestions for improvement
+
+Respond in this exact JSON format, with one entry per ITEM:
+{{
+    "results": [
+        {{
+            "index": 0,
+            "criteria_scores": {{
+                "completeness": 0.0,
+                "accuracy": 0.0,
+                "relevance": 0.0
+            }},
+            "validation_details": {{
+                "completeness": "explanation here",
+                "accuracy": "explanation here",
+                "relevance": "explanation here"
+            }},
+            "suggestions": ["suggestion 1", "suggestion 2"]
+        }}
+    ]
+}}
+"""
+                
+                response = self.openai_client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": _JSON_SYSTEM_MESSAGE},
+                        {"role": "user", "content": validation_prompt}
+                    ],
+                    temperature=0.1,
+                    response_format={"type": "json_object"}
+                )
+                
+                batch_result = orjson.loads(response.choices[0].message.content.encode())
+                items = batch_result.get('results', []) if isinstance(batch_result, dict) else []
+                by_index = {
+                    item.get('index'): item
+                    for item in items
+                    if isinstance(item, dict) and self._is_valid_ai_result(item)
+                }
+            except Exception as e:
+                print(f"AI batch validation failed: {e}")
+                by_index = {}
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": validation_prompt}],
-                temperature=0.1
-            )
-            
-            # Parse AI response
-            import json
-            ai_result = json.loads(response.choices[0].message.content)
-            return ai_result
-            
-        except Exception as e:
-            print(f"AI validation failed: {e}")
-            return self._perform_basic_checks(question, answer, context_docs)
+            # Any item the model skipped falls back to the basic checks
+            for index, qa_pair in enumerate(chunk):
+                ai_result = by_index.get(index)
+                if ai_result:
+                    ai_result.pop('index', None)
+                    results.append(ai_result)
+                else:
+                    results.append(self._perform_basic_checks(qa_pair['question'], qa_pair['answer'], qa_pair.get('context_docs', [])))
+        
+        return results
+    
+    def _is_valid_ai_result(self, ai_result: Any) -> bool:
+        """Check that an AI validation result has numeric scores for every criterion"""
+        if not isinstance(ai_result, dict):
+            return False
+        scores = ai_result.get('criteria_scores')
+        if not isinstance(scores, dict):
+            return False
+        if not all(isinstance(scores.get(criterion), (int, float)) for criterion in self.validation_criteria):
+            return False
+        return (isinstance(ai_result.get('validation_details', {}), dict)
+                and isinstance(ai_result.get('suggestions', []), list))
     
     def _summarize_context(self, context_docs: List[Dict[str, Any]]) -> str:
-        """Summarize context documents for validation"""
-        if not context_docs:
-            return "No context available"
-        
-        summary_parts = []
-        for doc in context_docs[:3]:  # Top 3 most relevant
-            brand = doc.get('brand', 'Unknown')
-            product = doc.get('product_category', 'Unknown')
-            doc_type = doc.get('document_type', 'Unknown')
-            summary_parts.append(f"- {brand} {product} {doc_type}")
-        
-        return "\n".join(summary_parts)
+        """Summarize the top 3 most relevant context documents for validation"""
+        return "\n".join(
+            f"- {doc.get('brand', 'Unknown')} {doc.get('product_category', 'Unknown')} {doc.get('document_type', 'Unknown')}"
+            for doc in context_docs[:3]
+        ) or "No context available"
     
     def _calculate_overall_score(self, criteria_scores: Dict[str, float]) -> float:
         """Calculate weighted overall score"""
@@ -161,16 +458,54 @@ Respond in this exact JSON format:
             total_score += score * weight
         return total_score
     
-    def validate_batch(self, qa_pairs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Validate multiple question-answer pairs"""
+    def validate_batch(self, qa_pairs: List[Dict[str, Any]], batch_size: int = 8) -> List[Dict[str, Any]]:
+        """Validate multiple question-answer pairs, batching the AI validation requests"""
+        checks = [self._perform_basic_checks(qa_pair['question'], qa_pair['answer'], qa_pair.get('context_docs', []))
+                  for qa_pair in qa_pairs]
+        
+        # Only pairs whose basic score is inconclusive are sent to the LLM
+        if self.openai_client:
+            escalate = [index for index, check in enumerate(checks) if self._needs_ai_validation(check)]
+            if escalate:
+                ai_checks = self._perform_ai_validation_batch([qa_pairs[index] for index in escalate], batch_size)
+                for index, ai_check in zip(escalate, ai_checks):
+                    checks[index] = ai_check
+        
         results = []
-        for qa_pair in qa_pairs:
-            validation = self.validate_answer(
-                qa_pair['question'],
-                qa_pair['answer'], 
-                qa_pair.get('context_docs', [])
-            )
+        for qa_pair, check in zip(qa_pairs, checks):
+            validation = self._score_validation({
+                'overall_score': 0.0,
+                'is_valid': False,
+                'criteria_scores': {},
+                'validation_details': {},
+                'suggestions': [],
+                **check
+            })
             validation['question'] = qa_pair['question']
             validation['answer'] = qa_pair['answer']
             results.append(validation)
-        return results 
\ No newline at end of file
+        return results 
+    
+    async def validate_batch_async(self, qa_pairs: List[Dict[str, Any]], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Validate multiple question-answer pairs concurrently, at most max_concurrency in flight"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        # One client for the whole batch, bound to this event loop and closed with it
+        async_client = create_async_openai_client() if self.openai_client else None
+        
+        async def validate(qa_pair: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                validation = await self.validate_answer_async(
+                    qa_pair['question'],
+                    qa_pair['answer'],
+                    qa_pair.get('context_docs', []),
+                    async_client
+                )
+            validation['question'] = qa_pair['question']
+            validation['answer'] = qa_pair['answer']
+            return validation
+        
+        try:
+            return await asyncio.gather(*(validate(qa_pair) for qa_pair in qa_pairs))
+        finally:
+            if async_client is not None:
+                await async_client.close()